@@ -0,0 +1,142 @@
+# benchmarks for the deck, hand totals, settlement and whole rounds
+import argparse
+import json
+import random
+import sys
+import time
+from itertools import cycle
+
+from blackjackmodify import MIN_BET, Dealer, Player, Poker, RoundEngine, decks_for
+
+
+class Scripted:
+    """decisions read from fixed lists in turn"""
+
+    def __init__(self, choices=("hit", "stand", "double down", "split", "surrender", "stand"),
+                 hit_again=(True, False, False), insure=(False, True)):
+        self._choices = cycle(choices)
+        self._hit_again = cycle(hit_again)
+        self._insure = cycle(insure)
+
+    def choose(self, player, hand, options):
+        return next(self._choices)
+
+    def hit_again(self, player, hand):
+        return next(self._hit_again)
+
+    def insure(self, player):
+        return next(self._insure)
+
+    def rebuy(self, player):
+        return MIN_BET
+
+
+def deal_hands(count, seed=0):
+    """players holding a mix of soft and hard hands of 2 to 5 cards"""
+    random.seed(seed)
+    p = Poker()
+    players = []
+    for i in range(count):
+        p.shuffle()
+        player = Player(f'player {i}', MIN_BET)
+        for _ in range(random.randint(2, 5)):
+            player.get(p.next)
+        players.append(player)
+    return players
+
+
+def bench_deck():
+    p = Poker()
+
+    def op():
+        p.shuffle()
+        for _ in range(52):
+            p.next
+    return op
+
+
+def bench_sum_on_hand():
+    players = cycle(deal_hands(1000))
+
+    def op():
+        player = next(players)
+        player.sum_on_hand(player.cards_on_hand)
+    return op
+
+
+def bench_get_result():
+    players = cycle(deal_hands(1000))
+    dealer_sums = cycle(range(17, 22))
+
+    def op():
+        next(players).get_result(next(dealer_sums))
+    return op
+
+
+def bench_round():
+    random.seed(0)
+    players = [Player('player 1', MIN_BET), Player('player 2', MIN_BET), Player('player 3', MIN_BET)]
+    engine = RoundEngine(Poker(decks=decks_for(len(players))), players, Dealer("host"), Scripted())
+    return engine.play
+
+
+BENCHMARKS = {"deck": bench_deck, "sum_on_hand": bench_sum_on_hand,
+              "get_result": bench_get_result, "round": bench_round}
+
+
+def measure(op, number, repeat):
+    """time `repeat` samples of `number` calls, return ops/sec and per-call percentiles in ns"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            op()
+        samples.append((time.perf_counter_ns() - start) / number)
+    samples.sort()
+
+    def percentile(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {"ops_per_sec": 1e9 / percentile(0.5), "p50_ns": percentile(0.5),
+            "p90_ns": percentile(0.9), "p99_ns": percentile(0.99)}
+
+
+def compare(results, baseline, threshold):
+    """names of the benchmarks slower than the baseline by more than threshold"""
+    slower = []
+    for name, result in results.items():
+        if name in baseline and result["ops_per_sec"] < baseline[name]["ops_per_sec"] * (1 - threshold):
+            slower.append(name)
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark the blackjack classes")
+    parser.add_argument("names", nargs="*", default=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--number", type=int, default=1000, help="calls per sample")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per benchmark")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, 0.1 is 10%%")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f'{"benchmark":<12}{"ops/sec":>14}{"p50 ns":>12}{"p90 ns":>12}{"p99 ns":>12}')
+    for name in args.names:
+        result = results[name] = measure(BENCHMARKS[name](), args.number, args.repeat)
+        print(f'{name:<12}{result["ops_per_sec"]:>14,.0f}{result["p50_ns"]:>12,.0f}'
+              f'{result["p90_ns"]:>12,.0f}{result["p99_ns"]:>12,.0f}')
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f), args.threshold)
+        if slower:
+            print(f'slower than the baseline: {",".join(slower)}')
+            return 1
+        print("no regression against the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
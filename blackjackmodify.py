@@ -1,12 +1,20 @@
 # Main author: Yip
 # Teacher: 駱昊
+import argparse
 import random
 from functools import total_ordering
 
+from render import NULL, TextRenderer
+from settlement import ORDINALS, Outcome, money, outcome_of, settle
+
+
+SUITS = '♠♥♣♦'
+
 
 @total_ordering
 class Card:
     """one single card"""
+    __slots__ = ('_suit', '_face')
 
     def __init__(self, suit, face):
         self._suit = suit
@@ -20,6 +28,11 @@ class Card:
     def suit(self):
         return self._suit
 
+    @property
+    def code(self):
+        """the card packed in one byte: suit in the high bits, face in the low 4 bits"""
+        return encode(self._suit, self._face)
+
     def __eq__(self, other):
         return self.face == other
 
@@ -42,42 +55,247 @@ class Card:
         return self.__str__()
 
 
+def encode(suit, face):
+    return SUITS.index(suit) << 4 | face
+
+
+def face_of(code):
+    return code & 0x0F
+
+
+# one shared Card view for every code, so dealing never creates objects
+CARDS = [None] * 64
+for _suit in SUITS:
+    for _face in range(1, 14):
+        CARDS[encode(_suit, _face)] = Card(_suit, _face)
+NEW_DECK = bytes(encode(suite, face) for suite in SUITS for face in range(1, 14))  # order of a new deck
+
+
+POINTS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)  # points of each face, Ace counted as 1
+HI_LO = (0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)  # Hi-Lo tag of each face
+
+
+def best_total(hard, aces):
+    """count one Ace as 11 when that does not bust"""
+    if aces and hard <= 11:
+        return hard + 10
+    return hard
+
+
 class Poker:
-    """deck of card"""
-    def __init__(self):
-        self._cards = [Card(suite, face)
-                       for suite in '♠♥♣♦'
-                       for face in range(1, 14)]
+    """deck of card, one byte per card
+
+    the deck keeps how many cards of each face are left and the Hi-Lo running
+    count of the cards dealt, both updated as each card is dealt
+    """
+    def __init__(self, rng=None, decks=1):
+        self._cards = bytearray(NEW_DECK * decks)
         self._current = 0
+        self._rng = rng if rng is not None else random  # anything with shuffle() and randrange()
+        self._full = [0] + [len(SUITS) * decks] * 13  # cards of each face in a full deck, by face
+        self._left = self._full[:]
+        self._running = 0
 
     @property
     def cards(self):
-        return self._cards
+        return [CARDS[code] for code in self._cards]
+
+    def _recount(self):
+        self._left = self._full[:]
+        self._running = 0
 
-    def shuffle(self):
-        """random shuffle"""
+    def shuffle(self, needed=0):
+        """random shuffle, whatever is left"""
         self._current = 0
-        random.shuffle(self._cards)
+        self._rng.shuffle(self._cards)
+        self._recount()
+
+    def reset(self):
+        """put the cards back in the order of new decks, so a seeded rng always deals the same"""
+        self._cards[:] = NEW_DECK * (len(self._cards) // len(NEW_DECK))
+        self._current = 0
+        self._recount()
 
     @property
     def next(self):
         """dealing cards"""
-        card = self._cards[self._current]
+        code = self._cards[self._current]
         self._current += 1
-        return card
+        face = code & 0x0F
+        self._left[face] -= 1
+        self._running += HI_LO[face]
+        return CARDS[code]
+
+    @property
+    def remaining(self):
+        """cards not dealt yet"""
+        return len(self._cards) - self._current
+
+    @property
+    def position(self):
+        """cards dealt since the last shuffle"""
+        return self._current
+
+    def dealt_since(self, position):
+        """codes of the cards dealt from position on, in the order they were dealt"""
+        return bytes(self._cards[position:self._current])
+
+    @property
+    def capacity(self):
+        """cards there are to deal in a round right after a shuffle"""
+        return len(self._cards)
+
+    def left(self, face):
+        """cards of this face not dealt yet"""
+        return self._left[face]
+
+    @property
+    def rank_counts(self):
+        """cards left of each face, indexed by face (index 0 is unused)"""
+        return tuple(self._left)
+
+    @property
+    def running_count(self):
+        return self._running
+
+    @property
+    def true_count(self):
+        """running count per deck left"""
+        if not self.remaining:
+            return 0.0
+        return self._running * len(NEW_DECK) / self.remaining
+
+    def getstate(self):
+        """the order of the cards, how far they are dealt, the counts and the rng's state"""
+        return {"cards": bytes(self._cards), "current": self._current, "left": self._left[:],
+                "running": self._running, "rng": self._rng.getstate()}
+
+    def setstate(self, state):
+        self._cards[:] = state["cards"]
+        self._current = state["current"]
+        self._left = state["left"][:]
+        self._running = state["running"]
+        self._rng.setstate(state["rng"])
 
     def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [CARDS[code] for code in self._cards[item]]
+        return CARDS[self._cards[item]]
+
+
+class Shoe(Poker):
+    """several decks dealt until the cut card comes out
+
+    the shoe is shuffled lazily: every deal swaps a random card from the undealt
+    part into place (one Fisher–Yates step), so cards never dealt are never shuffled
+    """
+    def __init__(self, decks=6, penetration=0.75, rng=None):
+        super().__init__(rng, decks)
+        self._cut = int(len(self._cards) * penetration)  # position of the cut card
+
+    @property
+    def cut_card_out(self):
+        return self._current >= self._cut
+
+    def must_shuffle(self, needed=0):
+        """the cut card has come out, or fewer than `needed` cards are left for the round"""
+        return self.cut_card_out or self.remaining < needed
+
+    def shuffle(self, needed=0):
+        """reshuffle only when the cut card has come out or the round could run out of cards"""
+        if self.must_shuffle(needed):
+            self._current = 0
+            self._recount()
+
+    @property
+    def next(self):
+        """dealing cards"""
+        cards = self._cards
+        current = self._current
+        pick = self._rng.randrange(current, len(cards))
+        cards[current], cards[pick] = cards[pick], cards[current]
+        code = cards[current]
+        self._current = current + 1
+        face = code & 0x0F
+        self._left[face] -= 1
+        self._running += HI_LO[face]
+        return CARDS[code]
+
+
+MAX_CARDS = 5  # no hand takes more cards
+MAX_HANDS = 4  # a player may split again until holding 4 hands
+
+
+class Hand:
+    """up to 5 cards, with their bet, running total and status"""
+    __slots__ = ('_cards', 'size', 'bet', 'hard', 'aces', 'bust', 'have21', 'outcome')
+
+    def __init__(self, bet=0):
+        self._cards = [None] * MAX_CARDS
+        self.size = 0
+        self.bet = bet
+        self.hard = 0  # running total with every Ace counted as 1
+        self.aces = 0
+        self.bust = False
+        self.have21 = False
+        self.outcome = None  # the Outcome, once settled
+
+    def add(self, card):
+        self._cards[self.size] = card
+        self.size += 1
+        self.hard += POINTS[card.face]
+        if card.face == 1:
+            self.aces += 1
+        if self.hard > 21:
+            self.bust = True
+
+    @property
+    def total(self):
+        """the best total, False if bust"""
+        if self.bust:
+            return False
+        return best_total(self.hard, self.aces)
+
+    def sort(self, key):
+        self._cards[:self.size] = sorted(self._cards[:self.size], key=key)
+
+    def clear(self):
+        """no cards, the bet stays"""
+        self._cards[:self.size] = [None] * self.size
+        self.size = 0
+        self.hard = 0
+        self.aces = 0
+        self.bust = False
+        self.have21 = False
+        self.outcome = None
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._cards[:self.size][item]
+        if item < 0:
+            item += self.size
+        if not 0 <= item < self.size:
+            raise IndexError("hand index out of range")
         return self._cards[item]
 
+    def __iter__(self):
+        return iter(self._cards[:self.size])
+
+    def __repr__(self):
+        return repr(self._cards[:self.size])
+
 
 class Person(object):
     """for both dealer and players"""
+    __slots__ = ('_name', 'hand', 'natural')
+
     def __init__(self, name, bet):
         self._name = name
-        self._cards_on_hand = []
-        self._bet = bet
-        self.not_bust = True
-        self._21 = False
+        self.hand = Hand(bet)
+        self.natural = False  # 21 with the first two cards
 
     @property
     def name(self):
@@ -85,111 +303,80 @@ class Person(object):
 
     @property
     def cards_on_hand(self):
-        return self._cards_on_hand
-
-    @cards_on_hand.setter
-    def cards_on_hand(self, value):
-        self._cards_on_hand = value
+        return self.hand
 
     def __getitem__(self, a, b):
-        return self._cards_on_hand[a:b]
+        return self.hand[a:b]
 
     @property
     def bet(self):
-        return self._bet
+        return self.hand.bet
 
     @bet.setter
     def bet(self, value):
-        self._bet = value
+        self.hand.bet = value
+
+    @property
+    def not_bust(self):
+        return not self.hand.bust
 
     @property
     def have21(self):
-        return self._21
+        return self.hand.have21
 
     @have21.setter
     def have21(self, value):
-        self._21 = value
+        self.hand.have21 = value
 
     def __truediv__(self, other):
         return self.bet / other
 
-    def get(self, card):
-        """getting cards"""
-        self._cards_on_hand.append(card)
+    def get(self, card, hand=None):
+        """getting cards, into the first hand unless another is given"""
+        (self.hand if hand is None else hand).add(card)
 
     def arrange(self, card_key):
         """arrange the card"""
-        self._cards_on_hand.sort(key=card_key)
+        self.hand.sort(card_key)
 
     def sum_on_hand(self, hand=None):
-        total_big = 0
-        ace_in = None
-        for face in self._cards_on_hand:
-            if face > 10:
-                face = 10
-            if face == 1:
-                face = 11
-                ace_in = True
-            total_big = face + total_big
-        if total_big > 21 and ace_in:
-            if total_big - 10 < 21:  # take the smaller count
-                return total_big - 10
-            else:
-                self.not_bust = False
-                return False
-        elif total_big > 21:
-            self.not_bust = False
-            return False
-        else:
-            return total_big
+        """the running total, False if bust"""
+        return (self.hand if hand is None else hand).total
 
     def check_bust(self, hand=None):
-        if not self.sum_on_hand(self.cards_on_hand):
-            self.not_bust = False
-            self.bet = 0
+        hand = self.hand if hand is None else hand
+        total = hand.total
+        if not total:
+            hand.bet = 0
             return False
-        elif self.sum_on_hand(self.cards_on_hand) == 21:
-            print(f'{self.name} got 21!')
-            self.have21 = True
-            return True
-        else:
-            return True
+        elif total == 21:
+            hand.have21 = True
+        return True
 
     @property
     def natural_21(self):  # check whether the person got 21 in the beginning
-        if self.sum_on_hand(self.cards_on_hand) == 21:
-            self.have21 = True
+        if self.hand.total == 21:
+            self.hand.have21 = True
+            self.natural = True
             return True
         else:
             return False
 
     def clear(self):
-        self.cards_on_hand.clear()
-        self.not_bust = True
-        self.have21 = False
+        self.hand.clear()
+        self.natural = False
 
 
 class Player(Person):
-    def __init__(self, name, bet=0):
+    __slots__ = ('hands', '_insurance', '_have_surrender', 'staked', 'owner')
+
+    def __init__(self, name, bet=0, owner=None):
         super().__init__(name, bet)
-        self._second_hand = []
-        self._insurance = False
-        self._option = {"hit": self.hit, "stand": self.stand, "double down": self.double_down}
-        self._have_split = False
+        self.hands = [self.hand]  # more after splits, self.hand stays the first
+        self._insurance = 0  # the insurance bought, in cents
         self._have_surrender = False
-        self.initial_bet = bet
-        self._second_not_bust = True
-        self.first_not_bust = True
-        self.second_bet = 0
-        self.second_have21 = False
-
-    @property
-    def second_hand(self):
-        return self._second_hand
-
-    @second_hand.setter
-    def second_hand(self, value):
-        self.second_hand = value
+        self.staked = bet  # money put in this round, for counting the net result
+        self.owner = owner if owner is not None else name  # whose bankroll, one owner may play several hands
 
     @property
     def insurance(self):
@@ -199,22 +386,6 @@ class Player(Person):
     def insurance(self, value):
         self._insurance = value
 
-    @property
-    def option(self):
-        return self._option
-
-    @option.setter
-    def option(self, value):
-        self._option = value
-
-    @property
-    def second_not_bust(self):
-        return self._second_not_bust
-
-    @second_not_bust.setter
-    def second_not_bust(self, value):
-        self._second_not_bust = value
-
     @property
     def have_surrender(self):
         return self._have_surrender
@@ -225,303 +396,99 @@ class Player(Person):
 
     @property
     def have_split(self):
-        return self._have_split
-
-    @have_split.setter
-    def have_split(self, value):
-        self._have_split = value
-
-    def sum_on_hand(self, hand=None):
-        if hand == self.cards_on_hand:
-            total_big = 0
-            ace_in = None
-            for face in self.cards_on_hand:
-                if face > 10:
-                    face = 10
-                if face == 1:
-                    face = 11
-                    ace_in = True
-                total_big = face + total_big
-            if total_big > 21 and ace_in:
-                if total_big - 10 <= 21:
-                    return total_big - 10
-                else:
-                    self.not_bust = False
-                    return False
-            elif total_big > 21:
-                self.not_bust = False
-                return False
-            else:
-                return total_big
-        else:
-            total_big = 0
-            ace_in = None
-            for face in hand:
-                if face > 10:
-                    face = 10
-                if face == 1:
-                    face = 11
-                    ace_in = True
-                total_big = face + total_big
-            if total_big > 21 and ace_in:
-                if total_big - 10 <= 21:
-                    return total_big - 10
-                else:
-                    self.second_not_bust = False
-                    return False
-            elif total_big > 21:
-                self.second_not_bust = False
-                return False
-            else:
-                return total_big
+        return len(self.hands) > 1
 
-    def check_bust(self, hand=None):
-        if not self.have_split:
-            if not self.sum_on_hand(hand):
-                self.first_not_bust = False
-                self.bet = 0
-                return False
-            elif self.sum_on_hand(hand) == 21:
-                print(f'{self.name} got 21!')
-                self.have21 = True
-                return True
-            else:
-                return True
-        else:
-            if hand == self.cards_on_hand:
-                if not self.sum_on_hand(hand):
-                    self.first_not_bust = False
-                    self.bet = 0
-                    return False
-                elif self.sum_on_hand(hand) == 21:
-                    print(f'{self.name}\'s first hand got 21!')
-                    self.have21 = True
-                    return True
-                else:
-                    return True
-            else:
-                if not self.sum_on_hand(hand):
-                    self._second_not_bust = False
-                    self.second_bet = 0
-                    return False
-                elif self.sum_on_hand(hand) == 21:
-                    print(f'{self.name}\'s second hand got 21!')
-                    self.second_have21 = True
-                    return True
-                else:
-                    return True
+    @property
+    def all_bets(self):
+        """the bets of all the hands"""
+        return sum(hand.bet for hand in self.hands)
 
     def hit(self, card, hand):
-        hand.append(card.next)
-        if self.check_bust(hand) and self.have21:
-            print(self)
-            print("action completed\n" + "-" * 20)
-            return
-        elif self.check_bust(hand):
-            pass
-        else:
-            print(f'{self.name}:\n{hand}\tbet:{self.bet}')
-            return print(f'{self.name} bust!', end="\n\n")
-        print(self)
-        while len(hand) < 5:
-            ans = input("do you want to hit once more?(yes|no):")
-            if ans == "yes":
-                hand.append(card.next)
-                if self.check_bust(hand) and self.have21:  # if the player doesn't bust and have 21
-                    print(self)
-                    print("action completed\n" + "-" * 20)
-                    return
-                elif self.check_bust(hand):
-                    print(self)
-                else:  # the player busts
-                    print(f'{self.name}:\n{hand}\tbet:{self.bet}')
-                    print(f'{self.name} bust!\n' + "-" * 20)
-                    return
-            elif ans == "no":
-                print("action completed\n" + "-" * 20)
-                return
-            else:  # second chance for careless mistake in inputting
-                print("please enter a valid order, otherwise your decision will be defaulted as no")
-                hit_again = input('do you want to hit once more?').lower() == 'yes'
-                if hit_again:
-                    hand.append(card.next)
-                    if self.check_bust(hand):
-                        print(self)
-                    else:
-                        print(f'{self.name}:\n{hand}\tbet:{self.bet}')
-                        print(f'{self.name} burst!', end="\n")
-                        return
-                else:
-                    print(self)
-                    print("action completed\n", "-" * 20)
-                    return
-        else:
-            print("you cannot hit anymore as your total card number in hand reached 5\n" + "-" * 20)
-            return
+        """take one more card, return False if the hand busts"""
+        hand.add(card.next)
+        return self.check_bust(hand)
 
     def stand(self):
-        print(self)
-        print("action completed\n" + "-" * 20)
         return
 
     def double_down(self, card, hand):
-        if hand == self.cards_on_hand:
-            self.bet *= 2
-            hand.append(card.next)
-            if self.check_bust(hand):
-                print(self)
-                print("action completed\n" + "-" * 20)
-                return
-            else:
-                print(self)
-                print(f'{self.name} bust!\n' + "-" * 20)
-                return
-        else:
-            self.second_bet *= 2
-            hand.append(card.next)
-            if self.check_bust(hand):
-                print(self)
-                print("action completed\n" + "-" * 20)
-                return
-            else:
-                print(self)
-                print(f'{self.name} bust!\n' + "-" * 20)
-                return
+        """double the bet of the hand and take exactly one more card"""
+        self.staked += hand.bet
+        hand.bet *= 2
+        hand.add(card.next)
+        return self.check_bust(hand)
 
     def surrender(self):
-        self.bet //= 2  # lost half of the player's bet
-        self.have_surrender = True
-        print(f'{self.name} has surrendered.')
-        print("action completed\n" + "-" * 20)
-        return
-
-    def split(self, card):
-        self.second_bet = self.bet * 1  # create another bet box
-        self._have_split = True
-        self.second_hand.append(self.cards_on_hand[1])
-        self._cards_on_hand = self.cards_on_hand[0:1]
-        print(self)
-        self.cards_on_hand.append(card.next)
-        self.second_hand.append(card.next)
-        if self.have21 and not self.second_have21:
-            print(self)
-            print("-" * 20)
-            print("[second hand]:\n")
-            self.choice(card, self.second_hand)
-        elif not self.have21 and not self.second_have21:
-            print(self)
-            print("-" * 20)
-            print("[first hand]:\n")
-            self.choice(card, self.cards_on_hand)
-            print("[second hand]:\n")
-            self.choice(card, self.second_hand)
-        elif self.have21 and self.second_have21:
-            print(self)
-            print("action completed\n" + "-" * 20)
-            return
-        else:
-            print(self)
-            print("-" * 20)
-            print("[first hand]:\n")
-            self.choice(card, self.cards_on_hand)
+        self.have_surrender = True  # lost half of the player's bet when settled
+
+    def split(self, card, hand=None):
+        """split the pair into two hands of one card each and deal both another, return the new hand"""
+        hand = self.hand if hand is None else hand
+        new = Hand(hand.bet)  # create another bet box
+        self.staked += new.bet
+        self.hands.insert(self.hands.index(hand) + 1, new)
+        first, second = hand
+        hand.clear()  # start both hands again with one card each
+        hand.add(first)
+        new.add(second)
+        hand.add(card.next)
+        new.add(card.next)
+        return new
 
     def decide_insurance(self):
-        print(f'{self.name}, do you want to buy insurance(yes|no):', end="")
-        want = input("")
-        if want == "yes":
-            self.bet *= 1.5
-            self.insurance = True
-        elif want == "no":
-            return
-        else:
-            print("please enter a valid order, otherwise your decision will be defaulted as no")
-            choice01 = {"yes": True, "no": False}.get(str(input("do you want to buy insurance(yes|no):")).lower(),
-                                                      False)
-            if choice01:
-                self.bet *= 1.5
-                self.insurance = True
-            else:
-                return
+        """buy insurance with half of the bet"""
+        self.insurance = self.bet // 2
+        self.staked += self.insurance
+
+    def choice(self, hand):
+        """options offered for the hand"""
+        options = ["hit", "stand", "double down"]
+        if len(hand) == 2 and hand[0] == hand[1] and len(self.hands) < MAX_HANDS:
+            options.append("split")
+        if len(self.hands) == 1 and len(hand) == 2:
+            options.append("surrender")
+        return options
 
-    def choice(self, card, hand):
-        if not self._have_split and hand[0] == hand[1]:
-            self.option.update({"split": self.split})
-        if self._have_split and "split" in self.option and "surrender" in self.option:
-            self.option.pop("split")
-            self.option.pop("surrender")
-        if (not self._have_split) and len(hand) == 2:
-            self.option.update({"surrender": self.surrender})
-        print(self)
-        print(f'options offered for {self.name}:{list(self.option.keys())}')
-        chosen = str(input("please type your decision here:")).lower()
-        if chosen in {"hit", "double down"}:
-            self.option[chosen](card, hand)
-        elif chosen == "split" and "split" in self.option:
-            self.option[chosen](card)
-        elif chosen in {'stand', 'surrender'}:
-            self.option[chosen]()
-        else:
-            print("\nplease enter a valid order, otherwise your decision will be defaulted as stand")
-            print(f'options offered for {self.name}:{list(self.option.keys())}')
-            chosen = input("please type your decision here:")
-            if chosen in {"hit", "double down"}:
-                self.option[chosen](card, hand)
-            elif chosen == "split" and "split" in self.option:
-                self.option[chosen](card)
-            elif chosen in {'stand', 'surrender'}:
-                self.option[chosen]()
-            else:
-                self.option["stand"]()
+    @property
+    def net(self):
+        """money won in this round, negative when lost"""
+        return self.all_bets - self.staked
 
     def get_result(self, dealer_sum):
-
-        def comp(a, b):  # four situation in comparing
-            if a == b:
-                return "draw"
-            if a < b:
-                return "lost"
-            if a == 21:
-                return "win with 21"
-            return "bigger than host"
-
-        if not self._have_split:
-            return comp(self.sum_on_hand(self.cards_on_hand), dealer_sum)
-        else:
-            return f"{comp(self.sum_on_hand(self.cards_on_hand), dealer_sum)}|{comp(self.sum_on_hand(self.second_hand), dealer_sum)}"
+        """the Outcome of each hand, dealer_sum is False if the host busts"""
+        if len(self.hands) == 1:
+            return (outcome_of(self.hand.total, dealer_sum),)
+        return tuple(outcome_of(hand.total, dealer_sum) for hand in self.hands)
 
     def clear(self):  # restore the default value when starting a new game
+        self.hand.bet = self.all_bets
+        del self.hands[1:]
         super().clear()
-        self.second_hand.clear()
-        self._insurance = False
-        self._option = {"hit": self.hit, "stand": self.stand, "double down": self.double_down}
-        self._have_split = False
+        self._insurance = 0
         self._have_surrender = False
-        self._second_not_bust = True
-        self.first_not_bust = True
-        self.bet = self.bet + self.second_bet
-        self.second_bet = 0
-        self.second_have21 = False
+
+    def reset(self, bet):
+        """start again from one hand with this bet, whatever was won or split before"""
+        self.clear()
+        self.hand.bet = bet
 
     def __repr__(self):
-        if len(self.second_hand) > 0:
-            if self.first_not_bust and self.second_not_bust:
-                return f'{self.name}:\nfirst hand:{self.cards_on_hand} second hand: {self.second_hand}\tfirst bet:{self.bet}\tsecond bet:{self.second_bet}' \
-                       f'\t sum of first hand:{self.sum_on_hand(self.cards_on_hand)}\tsum of second hand:{self.sum_on_hand(self.second_hand)}'
-            elif not self.first_not_bust and self.second_not_bust:
-                return f'{self.name}:\nfirst hand:[bust] second hand: {self.second_hand}\tfirst bet:{self.bet}\tsecond bet:{self.second_bet}' \
-                       f'\t sum of second hand:{self.sum_on_hand(self.second_hand)}'
-            elif self.first_not_bust and not self.second_not_bust:
-                return f'{self.name}:\nfirst hand:{self.cards_on_hand} second hand:[bust]\tfirst bet:{self.bet}\tsecond bet:{self.second_bet}' \
-                       f'\t sum of first hand:{self.sum_on_hand(self.cards_on_hand)}'
-            else:
-                return f'{self.name}:\nfirst hand:[bust] second hand:[bust]\tfirst bet:{self.bet}\tsecond bet:{self.second_bet}'
-        elif not self.not_bust:
-            return f'{self.name}:\n[bust]\t bet:{self.bet}'
+        if len(self.hands) > 1:
+            cards = " ".join(f'{ORDINALS[index]} hand:' + ("[bust]" if hand.bust else f'{" " * (index > 0)}{hand}')
+                             for index, hand in enumerate(self.hands))
+            bets = "\t".join(f'{ORDINALS[index]} bet:{money(hand.bet)}' for index, hand in enumerate(self.hands))
+            sums = "\t".join(f'sum of {ORDINALS[index]} hand:{hand.total}'
+                             for index, hand in enumerate(self.hands) if not hand.bust)
+            return f'{self.name}:\n{cards}\t{bets}' + (f'\t {sums}' if sums else "")
+        elif self.hand.bust:
+            return f'{self.name}:\n[bust]\t bet:{money(self.bet)}'
         else:
-            return f'{self.name}:\n{self.cards_on_hand}\tbet:{self.bet}\t  sum:{self.sum_on_hand(self.cards_on_hand)}'
+            return f'{self.name}:\n{self.hand}\tbet:{money(self.bet)}\t  sum:{self.hand.total}'
 
 
 class Dealer(Person):
+    __slots__ = ('_blackjack', 'last')
+
     def __init__(self, name, bet=0):
         super().__init__(name, bet)
         self._blackjack = False
@@ -535,12 +502,9 @@ class Dealer(Person):
     def blackjack(self, value):
         self._blackjack = value
 
-    def get(self, card):
-        self.cards_on_hand.append(card)
-
     @property
     def natural_21(self):
-        if self.sum_on_hand == 21:
+        if self.sum_on_hand() == 21:
             self.blackjack = True
             return True
         else:
@@ -553,7 +517,7 @@ class Dealer(Person):
 
     def initial_secondT(self):
         check01 = self.cards_on_hand[1]
-        if check01.face == 10:
+        if check01.face >= 10:
             self.blackjack = True
             return True
         else:
@@ -581,255 +545,368 @@ def get_key(card):
     return card.face, card.suit
 
 
-def blackjack():
-    p = Poker()
-    p.shuffle()
-    players = [Player('player 1', 100), Player('player 2', 100), Player('player 3', 100)]
-    host = Dealer("host")
-    game = True
+MIN_BET = 100_00  # all money is in cents
+SEAT_CARDS = MAX_HANDS * MAX_CARDS  # the most cards one seat takes in a round: every hand split off full
+HOST_CARDS = 5
 
-    def player_get(time=1):
-        for count in range(time):
-            for people in players:
-                people.get(p.next)
 
-    def player_display():
-        for each in players:
-            each.arrange(get_key)
-            print(each)
+def decks_for(seats):
+    """the fewest decks that always have the cards for a round of the seats"""
+    needed = seats * SEAT_CARDS + HOST_CARDS
+    return -(-needed // len(NEW_DECK))
 
-    def host_get_display():
-        host.get(p.next)
-        print(host)
 
-    def all_display(time=1):
-        for times in range(time):
-            player_get()
-            player_display()
-            host_get_display()
-            print("-" * 20)
+def watch(strategy, host):
+    """show the host to a strategy that reads the host's cards, such as a policy.Policy"""
+    if hasattr(strategy, "watch"):
+        strategy.watch(host)
 
-    def all_clear():
-        for rubbish in players:
-            rubbish.clear()
-        host.clear()
 
-    def zero_bet():  # check any player has invalid bet
-        for player in players:
+def bankrolls(players):
+    """money of each owner over all the hands he or she plays"""
+    money_of = {}
+    for each in players:
+        money_of[each.owner] = money_of.get(each.owner, 0) + each.all_bets
+    return money_of
+
+
+class RoundEngine:
+    """the rules of one round, asking the strategy instead of input()
+
+    decisions() plays the round as a generator that yields every question for a
+    player, ("choose", player, hand, options), ("hit_again", player, hand),
+    ("insure", player) or ("rebuy", player), and takes the answer back by send().
+    play() answers them with the strategy; server.py answers them over the network.
+    what happens is told to the renderer as events (see render.py), flushed before
+    every question and at the end of the round.
+    """
+
+    def __init__(self, deck, players, host, strategy, renderer=None, timer=None):
+        self.deck = deck
+        self.players = players
+        self.host = host
+        self.strategy = strategy  # choose(), hit_again(), insure() and rebuy()
+        self.renderer = renderer if renderer is not None else NULL
+        self.timer = timer  # an instrument.Registry to time each phase, None costs nothing
+        self.round_start = 0  # deck.position when the round was dealt, see Poker.dealt_since()
+
+    @property
+    def strategy(self):
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, strategy):
+        self._strategy = strategy
+        watch(strategy, self.host)  # every strategy given to the engine sees its host
+
+    @property
+    def needed(self):
+        """the most cards a round of these seats may take"""
+        return len(self.players) * SEAT_CARDS + HOST_CARDS
+
+    def player_display(self):
+        for each in self.players:
+            each.arrange(get_key)
+            self.renderer.event("seat", player=each)
+
+    def all_display(self, time=1):
+        for times in range(time):
+            for people in self.players:
+                people.get(self.deck.next)
+            self.player_display()
+            self.host.get(self.deck.next)
+            self.renderer.event("host", host=self.host)
+            self.renderer.event("rule")
+
+    def all_clear(self):
+        for rubbish in self.players:
+            rubbish.clear()
+        self.host.clear()
+
+    def share_bankroll(self, player):
+        """a hand out of money takes the least bet from the richest other hand of the same owner, if it can spare it"""
+        richest = max((each for each in self.players if each.owner == player.owner and each is not player),
+                      key=lambda each: each.bet, default=None)
+        if richest is not None and richest.bet >= 2 * MIN_BET:
+            richest.bet -= MIN_BET
+            player.bet += MIN_BET
+            self.renderer.event("stake moved", name=player.name, bet=MIN_BET, other=richest.name)
+
+    def zero_bet(self):  # check any player has invalid bet
+        for player in self.players:  # one owner's hands share a bankroll, before anyone is asked to rebuy
+            if player.bet <= 0:
+                self.share_bankroll(player)
+        for player in self.players:
             if player.bet <= 0:
-                print(
-                    f"{player.name},your bet must at least reach 100,please add your bet,otherwise your bet will be defaulted 100.")
-
-                def inputNumber(message):
-                    while True:
-                        try:
-                            userInput = int(input(message))
-                        except ValueError:
-                            print("please enter a valid number,otherwise your bet will be will be defaulted 100.")
-                            continue
-                        else:
-                            return userInput
-
-                want_add = inputNumber("how much do you want to add:")
-                if want_add > 0 and player.bet + want_add >= 100:
+                self.renderer.flush()
+                want_add = yield "rebuy", player
+                if want_add > 0 and player.bet + want_add >= MIN_BET:
                     player.bet += want_add
                 else:
-                    print("please enter a valid number,otherwise your bet will be will be defaulted 100.")
-                    want_add01 = inputNumber("how much do you want to add:")
-                    if want_add01 > 0 and player.bet + want_add01 >= 100:
-                        player.bet += want_add01
-                    else:
-                        player.bet = 100
-
-    def play():
-        print("-" * 20)
-        all_clear()  # clear the hand
-        p.shuffle()  # shuffling cards
-        zero_bet()  # check bet
-        all_display(2)  # deal the cards to players and host
-        have_21 = []
-        for anyone in players:  # check who have got 21 and decide the situation
-            if anyone.natural_21:
-                have_21.append(anyone.name)
-                anyone.have21 = True
-        nonlocal game
-        game = False
-        if host.natural_21:  # these parts for anyone who got 21 in the beginning
-            have_21.append(host.name)
-        if len(have_21) > 1 and host.blackjack:  # draw
-            print(f'{",".join(have_21)} have 21.')
-            print("Draw")
-            game = input("new game?(yes|no):").lower() == "yes"
-            print()
-            return
-        elif host.name in have_21:  # host wins
-            if host.check_Ace:  # let the players have a chance to win money if the first card of host is Ace
-                player_display()
-                for everyone in players:
-                    everyone.decide_insurance()
-                print(host)
-                print("Players who bought insurance won 2 times of the insurance!")
-                for have in players:
-                    if have.insurance:
-                        have.bet = have.bet * 5 // 3  # return the insurance and win 2 times of the insurance
-                        print(f'{have.name}\'s current bet is {have.bet}:')
-                game = input("new game?(yes|no):").lower() == "yes"
-                print()  # for clearer display
-                return
-            else:  # if the first card is T, no chance.
-                print(f'{host.name} has 21')
-                print(f'{host.name} wins!')
-                print(host)
-                game = input("new game?(yes|no):").lower() == "yes"
-                print()
-                return
-        elif host.name not in have_21 and have_21:  # player(s) win
-            print()
-            print(f'{",".join(have_21)} has 21')
-            print(f'{",".join(have_21)} wins!Profit is 150% of his/her bet')
-            for __ in players:
-                if __.have21:
-                    __.bet *= 2.5
-                    print(f'{__.name}\'s current bet is {__.bet}:')
-            game = input("new game?(yes|no):").lower() == "yes"
-            print()
-            return
-        else:
-            pass
+                    player.bet = MIN_BET
+            player.staked = player.bet
 
-        if host.check_Ace:  # if the host gets Ace, the host need to ask whether the players want insurance
-            player_display()
-            for everyone in players:
+    def insurance(self):
+        """offer insurance when the first card of host is Ace, return True if host has blackjack"""
+        self.player_display()
+        for everyone in self.players:
+            self.renderer.flush()
+            if (yield "insure", everyone):
                 everyone.decide_insurance()
-            if host.initial_secondT():
-                print(host, end="\n")
-                print(host)
-                print("Players who bought insurance won 2 times of the insurance!")
-                for have in players:
-                    if have.insurance:
-                        have.bet = have.bet * 5 // 3  # return the insurance and win 2 times of the insurance
-                        print(f'{have.name}\'s current bet is {have.bet}:')
-                game = input("new game?(yes|no):").lower() == "yes"
-                print()
+        if self.host.initial_secondT():
+            self.renderer.event("host", host=self.host)
+            self.renderer.event("insurance won")
+            return True
+        self.renderer.event("insurance lost", name=self.host.name)
+        return False
+
+    def hit(self, player, hand):
+        render = self.renderer.event
+        while True:
+            if not player.hit(self.deck, hand):  # the player busts
+                render("hand", name=player.name, hand=hand, bet=hand.bet)
+                render("bust", name=player.name)
                 return
-            else:
-                print(f"{host.name}did not get a blackjack,the insurance bought is lost,game goes on.")
-                print()
-                for _ in players:
-                    if _.insurance:
-                        _.bet = _.initial_bet  # player will lose their insurance and game goes on
-
-        for ask in players:  # ask players' decision
-            ask.choice(p, ask.cards_on_hand)
-
-        while True:  # the host will get card until he reach 17
-            host.last = True
-            if host.sum_on_hand() < 17 and len(host.cards_on_hand) < 5 and host.check_bust():
-                print(f"{host.name} is getting...")
-                host_get_display()
-            elif host.sum_on_hand() >= 17 or not host.check_bust():
-                print(f"{host.name} can't get anymore")
+            render("seat", player=player)
+            if player.sum_on_hand(hand) == 21:
+                render("got 21", name=player.name)
                 break
-
-        print("-" * 20)
-        if not host.not_bust:  # if the host busts
-            player_display()
-            print(host)
-            print(f'{host.name} bust!')
-            print("player(s) left with blackjack won profit of 1.5 times of his/her bet,else have 1 times")
-            for left in players:
-                if not left.have_split:  # for those who didn't split
-                    if left.have21:
-                        left.bet *= 2.5
-                        print(f'{left.name}\'s current bet:{left.bet}')
-                    elif left.not_bust:
-                        left.bet *= 2
-                        print(f'{left.name}\'s current bet:{left.bet}')
-                    print("-" * 20)
-                else:
-                    if left.have21:
-                        left.bet *= 2.5
-                        print(f'{left.name}\'s current first bet:{left.bet}')
-                    elif left.not_bust:
-                        left.bet *= 2
-                        print(f'{left.name}\'s current first bet:{left.bet}')
-                    if left.second_have21:
-                        left.second_bet *= 2.5
-                        print(f'{left.name}\'s current second bet:{left.second_bet}')
-                    elif left.second_not_bust:
-                        left.second_bet *= 2
-                        print(f'{left.name}\'s current second bet:{left.second_bet}')
-                    print("-" * 20)
-                game = input("new game?(yes|no):").lower() == "yes"
-                print()
+            if len(hand) >= MAX_CARDS:
+                render("five cards")
                 return
-
-        win_with_21 = []  # four situations if the host didn't bust
-        bigger_than_host = []
-        lost = []
-        draw = []
-        result = {"win_with_21": "player(s) left with blackjack won profit of 1.5 times of his/her bet ",
-                  "bigger_than_host": "player(s) who win host without 21 won profit of 1 times of his/her bet",
-                  "lost": "player(s) who lost host without 21 lost his/her bet",
-                  "draw": "player(s) who got a draw have their bet return"}  # description of result
-
-        for winner in players:
-            if not winner.have_surrender and not winner.have_split:  # for player who didn't surrender and didn't split
-                situation = winner.get_result(host.sum_on_hand())
-                if situation == "win with 21":
-                    winner.bet *= 2.5
-                    win_with_21.append(winner.name)
-                elif situation == "bigger than host":
-                    winner.bet *= 2
-                    bigger_than_host.append(winner.name)
-                elif situation == "draw":
-                    draw.append(winner.name)
-                else:
-                    winner.bet = 0
-                    lost.append(winner.name)
-            elif not winner.have_surrender and winner.have_split:  # for player who have split and didn't surrender
-                situation01 = (winner.get_result(host.sum_on_hand()).split("|"))[0]
-                situation02 = (winner.get_result(host.sum_on_hand()).split("|"))[1]
-                if situation01 == "win with 21":  # the situation for first hand
-                    winner.bet *= 2.5
-                    win_with_21.append(f'{winner.name}\'s first hand')
-                elif situation01 == "bigger than host":
-                    winner.bet *= 2
-                    bigger_than_host.append(f'{winner.name}\'s first hand')
-                elif situation01 == "draw":
-                    draw.append(f'{winner.name}\'s first hand')
+            self.renderer.flush()
+            if not (yield "hit_again", player, hand):
+                break
+        render("done")
+
+    def decide(self, player, hand):
+        render = self.renderer.event
+        options = player.choice(hand)
+        render("seat", player=player)
+        render("options", name=player.name, options=options)
+        self.renderer.flush()
+        chosen = yield "choose", player, hand, options
+        if chosen not in options:
+            chosen = "stand"
+        if self.timer:
+            self.timer.count(chosen)
+        if chosen == "hit":
+            yield from self.hit(player, hand)
+        elif chosen == "double down":
+            if player.double_down(self.deck, hand):
+                render("seat", player=player)
+                render("done")
+            else:
+                render("seat", player=player)
+                render("bust", name=player.name)
+        elif chosen == "split":
+            new = player.split(self.deck, hand)
+            render("seat", player=player)
+            for each in (hand, new):
+                name = ORDINALS[player.hands.index(each)]
+                player.check_bust(each)
+                if player.sum_on_hand(each) == 21:
+                    render("split 21", name=player.name, hand=name)
                 else:
-                    winner.bet = 0
-                    lost.append(f'{winner.name}\'s first hand')
-
-                if situation02 == "win with 21":  # the situation for second hand
-                    winner.second_bet *= 2.5
-                    win_with_21.append(f'{winner.name}\'s second hand')
-                elif situation02 == "bigger than host":
-                    winner.second_bet *= 2
-                    bigger_than_host.append(f'{winner.name}\'s second hand')
-                elif situation02 == "draw":
-                    draw.append(f'{winner.name}\'s second hand')
+                    render("split hand", hand=name)
+                    yield from self.decide(player, each)
+        elif chosen == "surrender":
+            player.surrender()
+            render("surrendered", name=player.name)
+            render("done")
+        else:
+            player.stand()
+            render("seat", player=player)
+            render("done")
+
+    def host_draw(self):
+        """the host will get card until he reach 17"""
+        self.host.last = True
+        while self.host.check_bust() and self.host.sum_on_hand() < 17 and len(self.host.cards_on_hand) < 5:
+            self.renderer.event("host draws", name=self.host.name)
+            if self.timer:
+                self.timer.count("host draws")
+            self.host.get(self.deck.next)
+            self.renderer.event("host", host=self.host)
+        self.renderer.event("host stops", name=self.host.name)
+
+    def play(self):
+        """play one round with the strategy, return the names in each of the four situations"""
+        strategy = self.strategy
+        steps = self.decisions()
+        try:
+            question = next(steps)
+            while True:
+                question = steps.send(getattr(strategy, question[0])(*question[1:]))
+        except StopIteration as end:
+            return end.value
+
+    def decisions(self):
+        """play one round, yielding the questions for the players"""
+        timer = self.timer
+        if timer:
+            timer.start()
+        render = self.renderer.event
+        needed = self.needed
+        if needed > self.deck.capacity:
+            raise ValueError(f'{len(self.players)} seats may need {needed} cards in a round, '
+                             f'the deck only has {self.deck.capacity}')
+        result = {"win_with_21": [], "bigger_than_host": [], "lost": [], "draw": []}
+        render("rule")
+        self.all_clear()  # clear the hand
+        self.deck.shuffle(needed)  # shuffling cards, a shoe only when it could run out
+        self.round_start = self.deck.position
+        if timer:
+            timer.lap("shuffle")
+        yield from self.zero_bet()  # check bet
+        if timer:
+            timer.lap("bets")
+        self.all_display(2)  # deal the cards to players and host
+        if timer:
+            timer.lap("deal")
+        have_21 = [anyone.name for anyone in self.players if anyone.natural_21]  # check who have got 21
+        host_21 = self.host.natural_21
+        if timer:
+            timer.lap("natural 21")
+            timer.count("rounds")
+
+        if self.host.check_Ace:  # if the host gets Ace, every seat is asked about insurance before anything is settled
+            yield from self.insurance()
+            if timer:
+                timer.lap("insurance")
+
+        if host_21 or have_21:  # these parts for anyone who got 21 in the beginning
+            if host_21:
+                self.host.last = True
+                if have_21:  # draw for the players with 21
+                    render("naturals draw", names=have_21 + [self.host.name])
+                elif not self.host.check_Ace:  # if the first card is T, no chance.
+                    render("host natural", name=self.host.name)
+                    render("host", host=self.host)
+                outcomes = ((Outcome.DRAW,) if each.natural else (Outcome.HOST_BLACKJACK,) for each in self.players)
+            else:  # player(s) win, the others keep their bet
+                render("player natural", names=have_21)
+                outcomes = ((Outcome.WIN_21,) if each.natural else (Outcome.DRAW,) for each in self.players)
+            settle(self.players, outcomes, result, host_blackjack=host_21)
+            for each in self.players:
+                render("bet", name=each.name, bet=each.bet)
+            self.renderer.flush()
+            if timer:
+                timer.lap("settlement")
+                timer.count("host 21" if host_21 else "player 21")
+            return result
+
+        for ask in self.players:  # ask players' decision
+            yield from self.decide(ask, ask.cards_on_hand)
+        if timer:
+            timer.lap("decisions")
+
+        self.host_draw()
+        if timer:
+            timer.lap("host draw")
+        render("rule")
+        host_total = self.host.sum_on_hand()
+        if not host_total:
+            render("host bust", name=self.host.name)
+        settle(self.players, (each.get_result(host_total) for each in self.players), result)
+        render("calculating")  # just for fun
+        for bucket, names in result.items():
+            render("result", bucket=bucket, names=names)
+        render("rule")
+        self.player_display()
+        render("host", host=self.host)
+        self.renderer.flush()
+        if timer:
+            timer.lap("settlement")
+        return result
+
+
+class Console:
+    """decisions typed in by the players"""
+
+    def choose(self, player, hand, options):
+        chosen = str(input("please type your decision here:")).lower()
+        if chosen in options:
+            return chosen
+        print("\nplease enter a valid order, otherwise your decision will be defaulted as stand")
+        print(f'options offered for {player.name}:{options}')
+        return input("please type your decision here:")
+
+    def hit_again(self, player, hand):
+        ans = input("do you want to hit once more?(yes|no):")
+        if ans in {"yes", "no"}:
+            return ans == "yes"
+        print("please enter a valid order, otherwise your decision will be defaulted as no")
+        return input('do you want to hit once more?').lower() == 'yes'
+
+    def insure(self, player):
+        print(f'{player.name}, do you want to buy insurance(yes|no):', end="")
+        want = input("")
+        if want in {"yes", "no"}:
+            return want == "yes"
+        print("please enter a valid order, otherwise your decision will be defaulted as no")
+        return {"yes": True, "no": False}.get(str(input("do you want to buy insurance(yes|no):")).lower(), False)
+
+    def rebuy(self, player):
+        print(f"{player.name},your bet must at least reach 100,please add your bet,otherwise your bet will be defaulted 100.")
+
+        def inputNumber(message):
+            while True:
+                try:
+                    userInput = int(input(message))
+                except ValueError:
+                    print("please enter a valid number,otherwise your bet will be will be defaulted 100.")
+                    continue
                 else:
-                    winner.second_bet = 0
-                    lost.append(f'{winner.name}\'s second hand')
-            else:
-                pass
-        print("calculating result...\n" + "-" * 20)  # just for fun
-        print(result["win_with_21"] + ":\n" + ",".join(win_with_21))
-        print(result["bigger_than_host"] + ":\n" + ",".join(bigger_than_host))
-        print(result["lost"] + ":\n" + ",".join(lost))
-        print(result["draw"] + ":\n" + ",".join(draw))
-        print("-" * 20)
-        player_display()
-        print(host)
-        game = input("new game?(yes|no):").lower() == "yes"
-        print()
-        return
+                    return userInput
+
+        want_add = inputNumber("how much do you want to add:") * 100
+        if want_add > 0 and player.bet + want_add >= MIN_BET:
+            return want_add
+        print("please enter a valid number,otherwise your bet will be will be defaulted 100.")
+        return inputNumber("how much do you want to add:") * 100
 
+
+class MimicDealer:
+    """hit below 17 like the host, never buy insurance"""
+
+    def choose(self, player, hand, options):
+        return "hit" if player.sum_on_hand(hand) < 17 else "stand"
+
+    def hit_again(self, player, hand):
+        return player.sum_on_hand(hand) < 17
+
+    def insure(self, player):
+        return False
+
+    def rebuy(self, player):
+        return MIN_BET
+
+
+def blackjack(seats=3, hands=1):
+    """the console game at a table of `seats`, each player playing `hands` of them"""
+    p = Poker(decks=decks_for(seats))  # enough that a round never runs out
+    players = []
+    for seat in range(seats):
+        owner = f'player {seat // hands + 1}'
+        players.append(Player(f'{owner} hand {seat % hands + 1}' if hands > 1 else owner, MIN_BET, owner))
+    host = Dealer("host")
+    renderer = TextRenderer()
+    engine = RoundEngine(p, players, host, Console(), renderer=renderer)
+    game = True
     while game:
-        play()
+        engine.play()
+        if hands > 1:
+            for owner, bankroll in bankrolls(players).items():
+                renderer.event("bankroll", name=owner, bet=bankroll)
+            renderer.flush()
+        game = input("new game?(yes|no):").lower() == "yes"
+        print()
 
 
 if __name__ == '__main__':
-    blackjack()
+    parser = argparse.ArgumentParser(description="play blackjack on the console")
+    parser.add_argument("--seats", type=int, default=3, help="seats at the table, up to 7")
+    parser.add_argument("--hands", type=int, default=1, help="seats played by each player")
+    args = parser.parse_args()
+    blackjack(args.seats, args.hands)
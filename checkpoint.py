@@ -0,0 +1,52 @@
+# checkpoints of a simulation run: everything needed to go on from the last round saved
+import hashlib
+import os
+import pickle
+
+
+def save(path, state):
+    """write the state so that the file at path is always a whole checkpoint
+
+    it is written to a temporary file first and moved over the old one, so a run
+    killed while saving leaves the previous checkpoint as it was
+    """
+    temporary = f'{path}.tmp'
+    with open(temporary, "wb") as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def load(path):
+    """the state saved at path, None if there is none"""
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def strategy_key(strategy):
+    """what tells one strategy from another in a run: its class, and the tables of a policy.Policy"""
+    key = f'{type(strategy).__module__}.{type(strategy).__qualname__}'
+    tables = [getattr(strategy, name) for name in ("choices", "insurance") if hasattr(strategy, name)]
+    if tables:
+        key += ":" + hashlib.sha1(b"".join(table.tobytes() for table in tables)).hexdigest()
+    return key
+
+
+def capture(number, deck, players, stats, **more):
+    """the state of a run between rounds, number being the next round to play"""
+    return {"round": number, "deck": deck.getstate(),
+            "players": [{"bet": each.all_bets, "staked": each.staked} for each in players],
+            "stats": stats, **more}
+
+
+def restore(state, deck, players):
+    """put the deck and players back as captured, return the next round and the stats"""
+    deck.setstate(state["deck"])
+    for each, saved in zip(players, state["players"]):
+        each.reset(saved["bet"])
+        each.staked = saved["staked"]
+    return state["round"], state["stats"]
@@ -0,0 +1,107 @@
+# per-round results as numpy columns, flushed to .npy files in chunks
+import glob
+import os
+
+import numpy as np
+
+from blackjackmodify import MAX_HANDS
+from handlog import INSURANCE, MAX_ACTIONS, SPLIT, SURRENDER
+
+# name -> (dtype, shape of one row)
+COLUMNS = {
+    "round": (np.int64, ()),
+    "seat": (np.uint8, ()),
+    "cards": (np.uint8, (2,)),  # codes of the two cards dealt
+    "upcard": (np.uint8, ()),  # code of the host's first card
+    "actions": (np.uint8, (MAX_ACTIONS,)),  # handlog.ACTIONS codes, 0 for none
+    "flags": (np.uint8, ()),  # handlog flags: insurance, surrender, split
+    "totals": (np.int8, (MAX_HANDS,)),  # final total of each hand, 0 for bust or no hand
+    "host_total": (np.int8, ()),  # 0 for bust
+    "outcomes": (np.int8, (MAX_HANDS,)),  # settlement.Outcome of each hand, -1 for no hand
+    "net": (np.int64, ()),  # in cents
+}
+
+
+class ColumnSink:
+    """one row per seat per round, kept in preallocated columns
+
+    every `chunk` rows the columns are written out as <prefix>-<part>-<name>.npy
+    in the directory, so memory stays the same however long the run is
+    """
+
+    def __init__(self, directory, chunk=1 << 16, prefix="rounds"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.columns = {name: np.zeros((chunk,) + shape, dtype) for name, (dtype, shape) in COLUMNS.items()}
+        self._rows = 0
+        self._part = 0
+
+    def log_round(self, number, players, host, recorder=None):
+        """a row for every seat of a finished round; recorder is a handlog.Recorder, cleared by the caller"""
+        columns = self.columns
+        host_total = host.sum_on_hand() or 0
+        upcard = host.cards_on_hand[0].code
+        for seat, player in enumerate(players):
+            row = self._rows
+            columns["round"][row] = number
+            columns["seat"][row] = seat
+            dealt = recorder.dealt.get(id(player)) if recorder else None
+            if dealt is None:  # no choice was asked, the two cards are all the hand has
+                dealt = bytes(card.code for card in player.hand[:2])
+            columns["cards"][row] = tuple(dealt)
+            columns["upcard"][row] = upcard
+            actions = recorder.actions.get(id(player), b"") if recorder else b""
+            if len(actions) > MAX_ACTIONS:
+                raise ValueError(f'{len(actions)} actions do not fit in a row of {MAX_ACTIONS}')
+            columns["actions"][row] = tuple(actions) + (0,) * (MAX_ACTIONS - len(actions))
+            columns["flags"][row] = ((INSURANCE * bool(player.insurance)) | (SURRENDER * player.have_surrender)
+                                     | (SPLIT * player.have_split))
+            totals = [hand.total or 0 for hand in player.hands]
+            columns["totals"][row] = totals + [0] * (MAX_HANDS - len(totals))
+            columns["host_total"][row] = host_total
+            outcomes = [-1 if hand.outcome is None else hand.outcome for hand in player.hands]
+            columns["outcomes"][row] = outcomes + [-1] * (MAX_HANDS - len(outcomes))
+            columns["net"][row] = player.net
+            self._rows = row + 1
+            if self._rows == len(columns["round"]):
+                self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        for name, column in self.columns.items():
+            path = os.path.join(self.directory, f'{self.prefix}-{self._part:05d}-{name}.npy')
+            out = np.lib.format.open_memmap(path, mode="w+", dtype=column.dtype, shape=(self._rows,) + column.shape[1:])
+            out[:] = column[:self._rows]
+            out.flush()
+            del out
+        self._part += 1
+        self._rows = 0
+
+    def getstate(self):
+        """write out the rows kept so far, return what setstate() needs to go on writing"""
+        self.flush()
+        return {"part": self._part}
+
+    def setstate(self, state):
+        self._rows = 0
+        self._part = state["part"]
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(directory, prefix="*"):
+    """every column as a list of memory-mapped chunks, in the order they were written"""
+    loaded = {}
+    for name in COLUMNS:
+        paths = sorted(glob.glob(os.path.join(directory, f'{prefix}-*-{name}.npy')))
+        loaded[name] = [np.load(path, mmap_mode="r") for path in paths]
+    return loaded
@@ -0,0 +1,118 @@
+# common random numbers: strategies played on the very same shuffles, compared hand for hand
+import argparse
+import math
+import random
+
+from blackjackmodify import NEW_DECK, Dealer, MimicDealer, Player, Poker, RoundEngine, decks_for
+from simulate import Rules
+
+Z = 1.96  # 95% confidence
+
+
+class Stacked(Poker):
+    """a deck whose shuffle lays the cards out in the order stacked last"""
+
+    def __init__(self, decks=1):
+        super().__init__(decks=decks)
+        self._order = bytes(self._cards)
+
+    def stack(self, order):
+        self._order = order
+
+    def shuffle(self, needed=0):
+        self._cards[:] = self._order
+        self._current = 0
+        self._recount()
+
+
+class Table:
+    """one strategy with its own seats, playing on a stacked deck"""
+
+    def __init__(self, strategy, rules):
+        self.rules = rules
+        self.deck = Stacked(rules.decks)
+        self.players = [Player(f'player {seat + 1}', rules.bet) for seat in range(rules.seats)]
+        self.engine = RoundEngine(self.deck, self.players, Dealer("host"), strategy)
+
+    def play(self, order):
+        """the net of all seats for one round on the given order, in bets"""
+        self.deck.stack(order)
+        for each in self.players:
+            each.reset(self.rules.bet)
+        self.engine.play()
+        return sum(each.net for each in self.players) / self.rules.bet
+
+
+def interval(count, total, squares):
+    """mean and half width of its confidence interval from the sum and sum of squares"""
+    if count < 2:
+        return total / count if count else 0.0, math.inf
+    mean = total / count
+    variance = max(squares - total * mean, 0.0) / (count - 1)
+    return mean, Z * math.sqrt(variance / count)
+
+
+def compare(strategies, rounds, rules=None, seed=0):
+    """play every strategy on the same shuffles, report each EV and its difference from the first
+
+    every round draws one new order of the cards and each strategy plays it from
+    the top, so where their decisions part the hands go on with the same card
+    stream; the noise of the cards mostly cancels out of the paired difference
+    """
+    rules = rules if rules is not None else Rules(decks=1)
+    rng = random.Random(seed)
+    tables = [Table(strategy, rules) for strategy in strategies]
+    order = bytearray(NEW_DECK * rules.decks)
+    sums = [0.0] * len(tables)
+    squares = [0.0] * len(tables)
+    differences = [0.0] * len(tables)
+    difference_squares = [0.0] * len(tables)
+    for _ in range(rounds):
+        rng.shuffle(order)
+        shared = bytes(order)
+        nets = [table.play(shared) for table in tables]
+        for index, net in enumerate(nets):
+            sums[index] += net
+            squares[index] += net * net
+            difference = net - nets[0]
+            differences[index] += difference
+            difference_squares[index] += difference * difference
+    report = []
+    for index, strategy in enumerate(strategies):
+        ev, ev_width = interval(rounds, sums[index], squares[index])
+        difference, width = interval(rounds, differences[index], difference_squares[index])
+        report.append({"strategy": type(strategy).__name__, "ev": ev, "ev_ci": ev_width,
+                       "difference": difference, "difference_ci": width,
+                       "interval": (difference - width, difference + width)})
+    return report
+
+
+class DoubleOnEleven(MimicDealer):
+    """like MimicDealer, but doubles down on 10 and 11"""
+
+    def choose(self, player, hand, options):
+        if "double down" in options and player.sum_on_hand(hand) in (10, 11):
+            return "double down"
+        return super().choose(player, hand, options)
+
+
+STRATEGIES = {"mimic": MimicDealer, "double": DoubleOnEleven}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="compare strategies on the same shuffles")
+    parser.add_argument("rounds", type=int)
+    parser.add_argument("strategies", nargs="*", help=f'from {", ".join(STRATEGIES)}, the first is the baseline')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decks", type=int, help="decks shuffled every round, by default as few as the seats need")
+    parser.add_argument("--seats", type=int, default=1)
+    args = parser.parse_args()
+    if args.decks is None:
+        args.decks = decks_for(args.seats)
+    elif args.decks < decks_for(args.seats):
+        parser.error(f'{args.seats} seats need at least {decks_for(args.seats)} decks')
+    rules = Rules(decks=args.decks, seats=args.seats)
+    strategies = [STRATEGIES[name]() for name in args.strategies or ["mimic", "double"]]
+    for line in compare(strategies, args.rounds, rules, args.seed):
+        print(f'{line["strategy"]:<16} ev {line["ev"]:+.4f} ± {line["ev_ci"]:.4f}   '
+              f'difference {line["difference"]:+.4f} ± {line["difference_ci"]:.4f}')
@@ -0,0 +1,30 @@
+# score many hands at once with numpy instead of Person.sum_on_hand
+import numpy as np
+
+MAX_CARDS = 5  # a hand can never hold more than 5 cards
+VALUES = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.int16)  # 0 is an empty slot
+
+
+def to_ranks(hands):
+    """turn lists of cards into an (N hands x 5) rank array, empty slots are 0"""
+    ranks = np.zeros((len(hands), MAX_CARDS), dtype=np.int8)
+    for row, hand in enumerate(hands):
+        ranks[row, :len(hand)] = [card.face for card in hand]
+    return ranks
+
+
+def evaluate(ranks):
+    """score every hand in one call
+
+    ranks is an (N hands x up to 5 cards) array of faces 1-13, 0 for no card.
+    return (hard, soft, bust, natural):
+    hard counts every Ace as 1, soft counts one Ace as 11 whenever it does not bust,
+    bust and natural are boolean arrays.
+    """
+    ranks = np.asarray(ranks)
+    hard = VALUES[ranks].sum(axis=1, dtype=np.int16)
+    has_ace = (ranks == 1).any(axis=1)
+    soft = np.where(has_ace & (hard <= 11), hard + 10, hard)
+    bust = hard > 21
+    natural = (np.count_nonzero(ranks, axis=1) == 2) & (soft == 21)
+    return hard, soft, bust, natural
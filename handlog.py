@@ -0,0 +1,179 @@
+# append-only binary hand history, one fixed-width record per seat per round
+import mmap
+import os
+import struct
+import sys
+
+from blackjackmodify import CARDS, MAX_CARDS, MAX_HANDS, money, watch
+
+# the most decisions of one seat in a round: every split, then a choice and up to 2 more hits on every hand
+MAX_ACTIONS = MAX_HANDS - 1 + MAX_HANDS * (MAX_CARDS - 2)
+# round, seed, seat, host cards, up to 4 hands of 5 cards, actions, flags, the bet of each hand
+_FIELDS = f'<QQB{MAX_CARDS}s{MAX_HANDS * MAX_CARDS}s{MAX_ACTIONS}sB{MAX_HANDS}q'
+RECORD = struct.Struct(_FIELDS + f'{-struct.calcsize(_FIELDS) % 32}x')  # 96 bytes, bets in cents
+ACTIONS = {"hit": 1, "stand": 2, "double down": 3, "split": 4, "surrender": 5}
+NAMES = {code: name for name, code in ACTIONS.items()}
+INSURANCE, SURRENDER, SPLIT = 1, 2, 4  # flags
+# the cards of each round, in <log>.deals: round and card count, then the card codes in the order dealt
+DEAL = struct.Struct("<QH")
+
+
+def pack_cards(hand):
+    """up to 5 cards as their one-byte codes, 0 for no card"""
+    return bytes(card.code for card in hand[:MAX_CARDS]).ljust(MAX_CARDS, b"\0")
+
+
+def unpack_cards(codes):
+    return [CARDS[code] for code in codes if code]
+
+
+class Recorder:
+    """a strategy that passes every question on and remembers the actions taken"""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.actions = {}  # id(player) -> bytearray of action codes
+        self.dealt = {}  # id(player) -> codes of the two cards dealt, seen at the first choice
+
+    def _note(self, player, code):
+        self.actions.setdefault(id(player), bytearray()).append(code)
+
+    def choose(self, player, hand, options):
+        if id(player) not in self.dealt:
+            self.dealt[id(player)] = bytes(card.code for card in hand[:2])
+        chosen = self.strategy.choose(player, hand, options)
+        self._note(player, ACTIONS[chosen] if chosen in options else ACTIONS["stand"])
+        return chosen
+
+    def hit_again(self, player, hand):
+        again = self.strategy.hit_again(player, hand)
+        self._note(player, ACTIONS["hit"] if again else ACTIONS["stand"])
+        return again
+
+    def watch(self, host):
+        watch(self.strategy, host)
+
+    def insure(self, player):
+        return self.strategy.insure(player)
+
+    def rebuy(self, player):
+        return self.strategy.rebuy(player)
+
+    def clear(self):
+        self.actions.clear()
+        self.dealt.clear()
+
+
+class HandLog:
+    """writer that appends records in batches
+
+    the cards dealt in each round go to <path>.deals, so a round can be played
+    again on a deck stacked with them (a lazily shuffled shoe has no order to seed)
+    """
+
+    def __init__(self, path, batch=4096):
+        self._file = open(path, "ab")
+        self._deals = open(path + ".deals", "ab")
+        self._buffer = bytearray()
+        self._dealt = bytearray()
+        self._limit = batch * RECORD.size
+
+    def write(self, number, seed, seat, host, player, actions=b""):
+        if len(actions) > MAX_ACTIONS:
+            raise ValueError(f'{len(actions)} actions do not fit in a record of {MAX_ACTIONS}')
+        flags = (INSURANCE * bool(player.insurance)) | (SURRENDER * player.have_surrender) | (SPLIT * player.have_split)
+        bets = [hand.bet for hand in player.hands] + [0] * (MAX_HANDS - len(player.hands))
+        self._buffer += RECORD.pack(number, seed, seat, pack_cards(host.cards_on_hand),
+                                    b"".join(pack_cards(hand) for hand in player.hands),
+                                    bytes(actions), flags, *bets)
+        if len(self._buffer) >= self._limit:
+            self.flush()
+
+    def log_round(self, number, seed, players, host, recorder=None, dealt=b""):
+        """one record for every seat of a finished round, and the codes of the cards it dealt
+
+        the recorder is a Recorder, cleared by the caller
+        """
+        for seat, player in enumerate(players):
+            actions = recorder.actions.get(id(player), b"") if recorder else b""
+            self.write(number, seed, seat, host, player, actions)
+        if dealt:
+            self._dealt += DEAL.pack(number, len(dealt)) + dealt
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+        self._deals.write(self._dealt)
+        self._deals.flush()
+        self._dealt.clear()
+
+    def getstate(self):
+        """write out the records kept so far, return what setstate() needs to go on writing after them"""
+        self.flush()
+        return {"records": os.fstat(self._file.fileno()).st_size, "deals": os.fstat(self._deals.fileno()).st_size}
+
+    def setstate(self, state):
+        """drop whatever was written after the state was taken"""
+        self._buffer.clear()
+        self._dealt.clear()
+        self._file.truncate(state["records"])
+        self._deals.truncate(state["deals"])
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._deals.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read(path):
+    """iterate the raw record tuples straight from the memory-mapped file"""
+    if not os.path.getsize(path):
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        unpack_from = RECORD.unpack_from
+        for offset in range(0, len(mm) - RECORD.size + 1, RECORD.size):  # a torn record at the end is skipped
+            yield unpack_from(mm, offset)
+
+
+def read_deals(path):
+    """iterate (round, codes of the cards dealt) from the .deals file of the log at path"""
+    with open(path + ".deals", "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + DEAL.size <= len(data):
+        number, count = DEAL.unpack_from(data, offset)
+        offset += DEAL.size
+        if offset + count > len(data):  # a torn deal at the end is skipped
+            return
+        yield number, data[offset:offset + count]
+        offset += count
+
+
+def describe(record):
+    """one record as readable text"""
+    number, seed, seat, host, hands, actions, flags, *bets = record
+    hands = [unpack_cards(hands[start:start + MAX_CARDS]) for start in range(0, len(hands), MAX_CARDS)]
+    count = sum(1 for hand in hands if hand)
+    text = f'round {number} seat {seat}: host {unpack_cards(host)} hand {hands[0]}'
+    for index in range(1, count):
+        text += f' hand {index + 1} {hands[index]}'
+    text += f' actions {[NAMES[code] for code in actions if code]} bet {money(bets[0])}'
+    for index in range(1, count):
+        text += f' bet {index + 1} {money(bets[index])}'
+    if flags & INSURANCE:
+        text += ' insured'
+    if flags & SURRENDER:
+        text += ' surrendered'
+    return text
+
+
+if __name__ == '__main__':
+    for each in read(sys.argv[1]):
+        print(describe(each))
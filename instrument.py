@@ -0,0 +1,46 @@
+# timing and counting the phases of a round
+import time
+
+
+class Registry:
+    """monotonic-clock time spent in each phase plus event counters
+
+    give one to RoundEngine(timer=...) to record; without one the engine only pays
+    an `if` per phase
+    """
+
+    def __init__(self):
+        self.totals = {}  # phase -> nanoseconds
+        self.laps = {}  # phase -> times the phase ran
+        self.counters = {}
+        self._last = 0
+
+    def start(self):
+        self._last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """charge the time since the last start() or lap() to the phase"""
+        now = time.perf_counter_ns()
+        self.totals[phase] = self.totals.get(phase, 0) + now - self._last
+        self.laps[phase] = self.laps.get(phase, 0) + 1
+        self._last = now
+
+    def count(self, event, times=1):
+        self.counters[event] = self.counters.get(event, 0) + times
+
+    def clear(self):
+        self.totals.clear()
+        self.laps.clear()
+        self.counters.clear()
+
+    def summary(self):
+        """the phases and counters as a text table"""
+        everything = sum(self.totals.values()) or 1
+        lines = [f'{"phase":<14}{"calls":>10}{"total ms":>12}{"mean us":>10}{"share":>8}']
+        for phase, total in sorted(self.totals.items(), key=lambda item: -item[1]):
+            lines.append(f'{phase:<14}{self.laps[phase]:>10}{total / 1e6:>12.1f}'
+                         f'{total / self.laps[phase] / 1e3:>10.2f}{total / everything:>8.1%}')
+        lines.append("-" * 54)
+        for event, times in sorted(self.counters.items()):
+            lines.append(f'{event:<14}{times:>10}')
+        return "\n".join(lines)
@@ -0,0 +1,151 @@
+# load test of the console game: blackjack() played with typed answers made up by a driver
+import argparse
+import builtins
+import random
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+from itertools import cycle
+
+from blackjackmodify import blackjack
+
+# the prompts of the console game, by the start of their text, and what kind of answer they want
+PROMPTS = (("please type your decision here", "choose"),
+           ("do you want to hit once more", "hit_again"),
+           ("do you want to buy insurance", "insure"),
+           ("how much do you want to add", "rebuy"),
+           ("new game?", "new_game"))
+
+# answers picked from at random, a few of them not valid so the retry prompts are used too
+ANSWERS = {"choose": ("hit", "stand", "double down", "split", "surrender", "Hit", "fold"),
+           "hit_again": ("yes", "no", "no", "maybe"),
+           "insure": ("yes", "no", "no", "nope"),
+           "rebuy": ("1", "2", "5", "0", "ten")}
+
+
+def kind_of(prompt):
+    if prompt == "":  # Console.insure() prints its question and asks with input("")
+        return "insure"
+    for start, kind in PROMPTS:
+        if prompt.startswith(start):
+            return kind
+    raise ValueError(f'no answer for the prompt {prompt!r}')
+
+
+class Sink:
+    """a stdout that only counts what is written"""
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, text):
+        self.written += len(text)
+        return len(text)
+
+    def flush(self):
+        return
+
+
+class Driver:
+    """stands in for input(): answers every prompt and says "no" to a new game after `rounds`
+
+    answers are taken in turn from script, a dict of kind -> answers, or picked at
+    random from ANSWERS for the kinds it leaves out. the end of every round, the
+    "new game?" prompt, is timed
+    """
+
+    def __init__(self, rounds, script=None, seed=0):
+        self.rounds = rounds
+        self.script = {kind: cycle(answers) for kind, answers in (script or {}).items()}
+        self.rng = random.Random(seed)
+        self.played = 0
+        self.answered = 0
+        self.latencies = []  # seconds of each round
+        self.last = ()  # the last prompts and answers, to show where a crash happened
+        self._start = time.perf_counter()
+
+    def __call__(self, prompt=""):
+        kind = kind_of(prompt)
+        if kind == "new_game":
+            now = time.perf_counter()
+            self.latencies.append(now - self._start)
+            self._start = now
+            self.played += 1
+            answer = "yes" if self.played < self.rounds else "no"
+        elif kind in self.script:
+            answer = next(self.script[kind])
+        else:
+            answer = self.rng.choice(ANSWERS[kind])
+        self.answered += 1
+        self.last = self.last[-9:] + ((prompt, answer),)
+        return answer
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def load_test(rounds, seats=3, hands=1, script=None, seed=0):
+    """play blackjack() for `rounds` rounds on the driver, return rounds/sec, latencies and any crash"""
+    random.seed(seed)  # the deck shuffles with the random module
+    driver = Driver(rounds, script, seed)
+    sink = Sink()
+    crash = None
+    typed = builtins.input
+    builtins.input = driver
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(sink):
+            blackjack(seats, hands)
+    except Exception:
+        crash = {"round": driver.played + 1, "error": traceback.format_exc(), "last": list(driver.last)}
+    finally:
+        elapsed = time.perf_counter() - start
+        builtins.input = typed
+    latencies = sorted(driver.latencies) or [0.0]
+    return {"rounds": driver.played, "seconds": elapsed, "rounds_per_sec": driver.played / elapsed,
+            "answers": driver.answered, "output_chars": sink.written,
+            "p50_us": percentile(latencies, 0.5) * 1e6, "p90_us": percentile(latencies, 0.9) * 1e6,
+            "p99_us": percentile(latencies, 0.99) * 1e6, "max_us": latencies[-1] * 1e6, "crash": crash}
+
+
+def read_script(path):
+    """a script file has one answer per line, as kind:answer, e.g. choose:hit"""
+    script = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                kind, answer = line.rstrip("\n").split(":", 1)
+                script.setdefault(kind, []).append(answer)
+    return script
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="load test the console game with made up answers")
+    parser.add_argument("rounds", type=int)
+    parser.add_argument("--seats", type=int, default=3)
+    parser.add_argument("--hands", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=1, help="games of `rounds` rounds, each with the next seed")
+    parser.add_argument("--script", help="file of kind:answer lines to answer with instead of random ones")
+    args = parser.parse_args(argv)
+    script = read_script(args.script) if args.script else None
+
+    crashed = 0
+    print(f'{"seed":<8}{"rounds":>8}{"rounds/sec":>12}{"p50 us":>10}{"p90 us":>10}{"p99 us":>10}{"max us":>10}')
+    for seed in range(args.seed, args.seed + args.games):
+        result = load_test(args.rounds, args.seats, args.hands, script, seed)
+        print(f'{seed:<8}{result["rounds"]:>8}{result["rounds_per_sec"]:>12,.0f}{result["p50_us"]:>10,.0f}'
+              f'{result["p90_us"]:>10,.0f}{result["p99_us"]:>10,.0f}{result["max_us"]:>10,.0f}')
+        if result["crash"]:
+            crashed += 1
+            print(f'crashed in round {result["crash"]["round"]} after:')
+            for prompt, answer in result["crash"]["last"]:
+                print(f'  {prompt!r} -> {answer!r}')
+            print(result["crash"]["error"])
+    return 1 if crashed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
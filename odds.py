@@ -0,0 +1,93 @@
+# exact odds of how the host's hand ends, from the upcard and the cards not seen yet
+from functools import lru_cache
+
+from blackjackmodify import POINTS, best_total
+
+CACHE_SIZE = 1 << 16  # compositions kept by each cache
+BUST = 22  # index of the bust chance in the tuples below
+
+
+def by_points(counts):
+    """counts indexed by face (index 0 unused) as counts by points 1 to 10"""
+    return tuple(counts[1:10]) + (sum(counts[10:14]),)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _finish(hard, aces, cards, counts):
+    """chance of each final total 0-21 (and bust at BUST) of a host hand drawing on
+
+    the host draws below 17 and stops at 5 cards, like RoundEngine.host_draw()
+    """
+    chances = [0.0] * (BUST + 1)
+    if hard > 21:
+        chances[BUST] = 1.0
+        return tuple(chances)
+    total = best_total(hard, aces)
+    left = sum(counts)
+    if total >= 17 or cards >= 5 or not left:
+        chances[total] = 1.0
+        return tuple(chances)
+    for index, count in enumerate(counts):
+        if count:
+            points = index + 1
+            rest = counts[:index] + (count - 1,) + counts[index + 1:]
+            weight = count / left
+            after = _finish(hard + points, aces + (points == 1), cards + 1, rest)
+            for total, chance in enumerate(after):
+                if chance:
+                    chances[total] += weight * chance
+    return tuple(chances)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _odds(up, counts, no_natural):
+    left = sum(counts)
+    chances = [0.0] * (BUST + 1)
+    blackjack = 0.0
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        points = index + 1
+        weight = count / left
+        hard, aces = up + points, (up == 1) + (points == 1)
+        if best_total(hard, aces) == 21:
+            blackjack += weight
+            continue
+        rest = counts[:index] + (count - 1,) + counts[index + 1:]
+        for total, chance in enumerate(_finish(hard, aces, 2, rest)):
+            if chance:
+                chances[total] += weight * chance
+    if no_natural and blackjack < 1:
+        chances = [chance / (1 - blackjack) for chance in chances]
+        blackjack = 0.0
+    return blackjack, tuple(chances)
+
+
+def dealer_odds(upcard, counts, no_natural=False):
+    """chance of each way the host's hand ends: "blackjack", "bust" and every final total
+
+    upcard is the host's first card or its face, counts the cards not seen yet
+    indexed by face (Poker.rank_counts, with the hidden card put back, see unseen()).
+    totals below 17 come from the 5 card limit. with no_natural the host is known
+    not to have a blackjack, as when the players decide in RoundEngine.decisions()
+    """
+    up = POINTS[getattr(upcard, "face", upcard)]
+    blackjack, chances = _odds(up, by_points(counts), no_natural)
+    odds = {"blackjack": blackjack, "bust": chances[BUST]}
+    for total, chance in enumerate(chances[:BUST]):
+        if chance:
+            odds[total] = chance
+    return odds
+
+
+def unseen(deck, host):
+    """counts by face of the cards the players have not seen: the deck and the host's hidden card"""
+    counts = list(deck.rank_counts)
+    for card in host.cards_on_hand[1:]:
+        counts[card.face] += 1
+    return counts
+
+
+def insurance_odds(deck, host):
+    """chance the host with an Ace up has a blackjack, the only case insurance pays"""
+    return dealer_odds(host.cards_on_hand[0], unseen(deck, host))["blackjack"]
@@ -0,0 +1,125 @@
+# improve a policy table cell by cell, each change tried by simulation over a process pool
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from blackjackmodify import NEW_DECK
+from compare import Table
+from handlog import ACTIONS, NAMES
+from policy import OPTION_SETS, RULES, Policy, compile_policy
+from simulate import Rules
+from stats import Moments
+
+STAGES = (1, 4, 16)  # rounds of each stage, in units of the rounds given
+
+
+def cells():
+    """every (total, soft, pair) a decision can be asked for, with the actions to try there"""
+    for total in range(5, 21):
+        yield (total, 0, 0), ("hit", "stand", "double down", "surrender")
+    for total in range(13, 21):
+        yield (total, 1, 0), ("hit", "stand", "double down", "surrender")
+    for pair in range(1, 11):
+        total, soft = (12, 1) if pair == 1 else (pair * 2, 0)
+        yield (total, soft, pair), ("hit", "stand", "double down", "split", "surrender")
+
+
+def candidates(policy):
+    """(kind, key, value) of every change of one cell to something else"""
+    for (total, soft, pair), actions in cells():
+        for up in range(1, 11):
+            current = NAMES[policy.choices[total, soft, pair, up, len(OPTION_SETS) - 2]]  # all options offered
+            for action in actions:
+                if action != current:
+                    yield "choice", (total, soft, pair, up), action
+    for total in range(4, 22):
+        for soft in (0, 1):
+            if soft and total < 12:
+                continue
+            yield "insurance", (total, soft), not policy.insurance[total, soft]
+
+
+def changed(choices, insurance, candidate):
+    """a Policy of the tables with the candidate applied"""
+    kind, key, value = candidate
+    choices, insurance = choices.copy(), insurance.copy()
+    if kind == "choice":
+        for index, options in enumerate(OPTION_SETS):
+            if value in options:  # where the action is not offered, the cell keeps its old answer
+                choices[key + (index,)] = ACTIONS[value]
+    else:
+        insurance[key] = value
+    return Policy(choices, insurance)
+
+
+def evaluate(task):
+    """EV of the candidate minus the policy's, played on the same shuffles in stages
+
+    stops as soon as the confidence interval of the difference is all below or
+    all above zero, or when no round has reached the cell;
+    return (candidate, mean, half width, rounds played)
+    """
+    choices, insurance, candidate, rules, rounds, seed = task
+    tables = [Table(Policy(choices, insurance), rules), Table(changed(choices, insurance, candidate), rules)]
+    rng = random.Random(seed)
+    order = bytearray(NEW_DECK * rules.decks)
+    difference = Moments()
+    for stage in STAGES:
+        for _ in range(stage * rounds - difference.count):
+            rng.shuffle(order)
+            shared = bytes(order)
+            difference.add(tables[1].play(shared) - tables[0].play(shared))
+        if difference.half_width < abs(difference.mean) or not difference.variance:
+            break  # clearly better or worse, or the cell never came up
+    return candidate, difference.mean, difference.half_width, difference.count
+
+
+def optimize(policy, rounds=10000, rules=None, workers=1, seed=0, passes=1, log=print):
+    """try every one-cell change of the policy, keep the best clear improvement of each cell
+
+    a change is kept when the interval of its EV difference is all above zero;
+    the kept changes are applied together at the end of a pass. the rules are the
+    ones RoundEngine plays, so the 5 card limit, surrender on two cards only,
+    splits and insurance all count as the game has them
+    """
+    rules = rules if rules is not None else Rules(decks=1)
+    choices, insurance = policy.choices.copy(), policy.insurance.copy()
+    for number in range(passes):
+        tasks = [(choices, insurance, candidate, rules, rounds, f'{seed}:{number}:{index}')
+                 for index, candidate in enumerate(candidates(Policy(choices, insurance)))]
+        if workers == 1:
+            results = list(map(evaluate, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(evaluate, tasks, chunksize=4))
+        best = {}
+        for candidate, mean, width, played in results:
+            kind, key, value = candidate
+            if mean - width > 0 and mean > best.get((kind, key), (None, 0.0))[1]:
+                best[kind, key] = candidate, mean
+        for candidate, mean in best.values():
+            log(f'pass {number + 1}: {candidate[0]} {candidate[1]} -> {candidate[2]} ({mean:+.4f} per round)')
+            kept = changed(choices, insurance, candidate)
+            choices, insurance = kept.choices, kept.insurance
+        log(f'pass {number + 1}: {len(tasks)} tried, {sum(each[3] for each in results):,} rounds, {len(best)} kept')
+        if not best:
+            break
+    return Policy(choices, insurance)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="improve a policy table by simulation")
+    parser.add_argument("start", help=f'a policy file, or one of {", ".join(RULES)}')
+    parser.add_argument("out", help="the .npz file to write the improved policy to")
+    parser.add_argument("--rounds", type=int, default=10000, help="rounds of the first stage of each try")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--passes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decks", type=int, default=1)
+    args = parser.parse_args()
+    start = compile_policy(RULES[args.start]) if args.start in RULES else Policy.load(args.start)
+    improved = optimize(start, args.rounds, Rules(decks=args.decks), args.workers, args.seed, args.passes)
+    improved.save(args.out)
+    print(f'{int(np.sum(improved.choices != start.choices))} table entries changed')
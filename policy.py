@@ -0,0 +1,141 @@
+# strategies compiled into lookup tables: a decision is one index, a batch one numpy lookup
+import argparse
+from itertools import product
+
+import numpy as np
+
+from blackjackmodify import MIN_BET, POINTS
+from handlog import ACTIONS, NAMES
+
+# the option lists Player.choice() offers, and the hit/stand of the hit_again question
+OPTION_SETS = (("hit", "stand", "double down"),
+               ("hit", "stand", "double down", "split"),
+               ("hit", "stand", "double down", "surrender"),
+               ("hit", "stand", "double down", "split", "surrender"),
+               ("hit", "stand"))
+HIT_AGAIN = 4  # index of the hit/stand set
+# total 0 (bust) to 21, soft, points of the pair (0 for none), points of the host's upcard, option set
+SHAPE = (22, 2, 11, 11, len(OPTION_SETS))
+
+
+def options_index(options):
+    return 4 if "double down" not in options else ("split" in options) + 2 * ("surrender" in options)
+
+
+def state(hand):
+    """(total, soft, pair) of a hand, the indices it takes in the tables"""
+    total = hand.total or 0
+    soft = int(bool(hand.aces) and hand.hard <= 11)
+    pair = POINTS[hand[0].face] if len(hand) == 2 and hand[0] == hand[1] else 0
+    return total, soft, pair
+
+
+class Policy:
+    """a strategy answering from compiled tables
+
+    the host's upcard is read from the host given to watch(); the RoundEngine
+    calls it with its host when the policy becomes its strategy
+    """
+
+    def __init__(self, choices, insurance, host=None):
+        self.choices = np.ascontiguousarray(choices, dtype=np.uint8)  # action codes, see handlog.ACTIONS
+        self.insurance = np.ascontiguousarray(insurance, dtype=np.bool_)  # by (total, soft)
+        self._flat = self.choices.tobytes()  # python ints on indexing, faster than numpy scalars
+        self._insure = self.insurance.tobytes()
+        self.host = host
+
+    def watch(self, host):
+        self.host = host
+
+    def _action(self, hand, options_set):
+        total, soft, pair = state(hand)
+        up = POINTS[self.host.cards_on_hand[0].face]
+        return NAMES[self._flat[(((total * 2 + soft) * 11 + pair) * 11 + up) * len(OPTION_SETS) + options_set]]
+
+    def choose(self, player, hand, options):
+        return self._action(hand, options_index(options))
+
+    def hit_again(self, player, hand):
+        return self._action(hand, HIT_AGAIN) == "hit"
+
+    def insure(self, player):
+        total, soft, pair = state(player.hand)
+        return bool(self._insure[total * 2 + soft])
+
+    def rebuy(self, player):
+        return MIN_BET
+
+    def decide(self, totals, soft, pairs, upcards, options_sets):
+        """action codes for a whole batch of seat states, arrays of table indices"""
+        return self.choices[totals, soft, pairs, upcards, options_sets]
+
+    def insure_many(self, totals, soft):
+        return self.insurance[totals, soft]
+
+    def save(self, path):
+        np.savez(path, choices=self.choices, insurance=self.insurance)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            return cls(saved["choices"], saved["insurance"])
+
+
+def compile_policy(rule, insure_rule=None):
+    """a Policy from rule(total, soft, pair, upcard, options) -> one of the options
+
+    totals, pairs and the upcard are in points, an Ace counting 1 as pair and
+    upcard; insure_rule(total, soft) -> bool, never insure without it
+    """
+    choices = np.zeros(SHAPE, dtype=np.uint8)
+    for total, soft, pair, up, options_set in product(*map(range, SHAPE)):
+        options = OPTION_SETS[options_set]
+        chosen = rule(total, bool(soft), pair, up, options)
+        if chosen not in options:
+            raise ValueError(f'rule chose {chosen!r} for total {total} soft {bool(soft)} pair {pair} '
+                             f'upcard {up}, not one of {options}')
+        choices[total, soft, pair, up, options_set] = ACTIONS[chosen]
+    insurance = np.zeros(SHAPE[:2], dtype=np.bool_)
+    if insure_rule:
+        for total, soft in product(*map(range, SHAPE[:2])):
+            insurance[total, soft] = insure_rule(total, bool(soft))
+    return Policy(choices, insurance)
+
+
+def mimic(total, soft, pair, up, options):
+    """MimicDealer as a rule"""
+    return "hit" if total < 17 else "stand"
+
+
+def basic(total, soft, pair, up, options):
+    """the usual basic strategy, an Ace up counted as 11"""
+    up = 11 if up == 1 else up
+    can_double = "double down" in options
+    if "split" in options and (pair in (1, 8) or (pair in (2, 3, 7) and up <= 7) or (pair == 6 and up <= 6)
+                               or (pair == 9 and up not in (7, 10, 11)) or (pair == 4 and up in (5, 6))):
+        return "split"
+    if "surrender" in options and not soft and (total == 16 and up >= 9 or total == 15 and up == 10):
+        return "surrender"
+    if soft:
+        if total >= 19:
+            return "stand"
+        if can_double and (total in (17, 18) and 3 <= up <= 6 or total in (15, 16) and 4 <= up <= 6
+                           or total in (13, 14) and 5 <= up <= 6):
+            return "double down"
+        return "stand" if total == 18 and up <= 8 else "hit"
+    if total >= 17 or 13 <= total <= 16 and up <= 6 or total == 12 and 4 <= up <= 6:
+        return "stand"
+    if can_double and (total == 11 or total == 10 and up <= 9 or total == 9 and 3 <= up <= 6):
+        return "double down"
+    return "hit"
+
+
+RULES = {"mimic": mimic, "basic": basic}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="compile a strategy rule into a policy file")
+    parser.add_argument("rule", choices=list(RULES))
+    parser.add_argument("path", help="the .npz file to write")
+    args = parser.parse_args()
+    compile_policy(RULES[args.rule]).save(args.path)
@@ -0,0 +1,125 @@
+# renderers: what RoundEngine tells about a round, as text, JSON lines or nothing
+#
+# the engine calls event(kind, **fields) as the round goes on and flush() before
+# every question and at the end of the round; fields are names, cards, amounts
+# in cents and the Player or Dealer concerned
+import json
+import sys
+
+from settlement import money
+
+RULE = "-" * 20
+RESULT = {"win_with_21": "player(s) left with blackjack won profit of 1.5 times of his/her bet ",
+          "bigger_than_host": "player(s) who win host without 21 won profit of 1 times of his/her bet",
+          "lost": "player(s) who lost host without 21 lost his/her bet",
+          "draw": "player(s) who got a draw have their bet return"}  # description of result
+
+TEXT = {  # how each event reads on the terminal
+    "rule": RULE,
+    "seat": "{player!r}",
+    "host": "{host!r}",
+    "hand": "{name}:\n{hand}\tbet:{bet}",
+    "bust": "{name} bust!\n" + RULE,
+    "got 21": "{name} got 21!",
+    "five cards": "you cannot hit anymore as your total card number in hand reached 5\n" + RULE,
+    "done": "action completed\n" + RULE,
+    "options": "options offered for {name}:{options}",
+    "split 21": "{name}'s {hand} hand got 21!",
+    "split hand": "[{hand} hand]:\n",
+    "surrendered": "{name} has surrendered.",
+    "insurance won": "Players who bought insurance won 2 times of the insurance!",
+    "insurance lost": "{name}did not get a blackjack,the insurance bought is lost,game goes on.",
+    "host draws": "{name} is getting...",
+    "host stops": "{name} can't get anymore",
+    "host bust": "{name} bust!",
+    "naturals draw": "{names} have 21.\nDraw",
+    "host natural": "{name} has 21\n{name} wins!",
+    "player natural": "{names} has 21\n{names} wins!Profit is 150% of his/her bet",
+    "bet": "{name}'s current bet is {bet}:",
+    "calculating": "calculating result...\n" + RULE,
+    "result": "{description}:\n{names}",
+    "bankroll": "{name}'s bankroll is {bet}",
+    "stake moved": "{name} takes {bet} from {other}",
+}
+
+
+class NullRenderer:
+    """shows nothing and formats nothing"""
+
+    def event(self, kind, **fields):
+        return
+
+    def flush(self):
+        return
+
+
+NULL = NullRenderer()
+
+
+class TextRenderer:
+    """the console text of the game, written out once per decision point"""
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self._lines = []
+
+    def text(self, kind, fields):
+        if "bet" in fields:
+            fields["bet"] = money(fields["bet"])
+        if "names" in fields:
+            fields["names"] = ",".join(fields["names"])
+        if kind == "result":
+            fields["description"] = RESULT[fields["bucket"]]
+        return TEXT[kind].format(**fields)
+
+    def event(self, kind, **fields):
+        # formatted now, the players change before the flush
+        self._lines.append(self.text(kind, fields))
+
+    def flush(self):
+        if self._lines:
+            self._lines.append("")
+            self.stream.write("\n".join(self._lines))
+            self.stream.flush()
+            self._lines.clear()
+
+
+def snapshot(value):
+    """the value as plain JSON data"""
+    if hasattr(value, "hard"):  # a Hand
+        return snapshot(value[:])
+    if isinstance(value, list):
+        return [snapshot(each) for each in value]
+    if hasattr(value, "hands"):  # a Player
+        return {"name": value.name, "hands": [snapshot(hand[:]) for hand in value.hands],
+                "totals": [hand.total or None for hand in value.hands],
+                "bets": [hand.bet for hand in value.hands]}
+    if hasattr(value, "blackjack"):  # the Dealer, with the cards the players can see
+        shown = value.cards_on_hand[:] if value.blackjack or value.last else value.cards_on_hand[:1]
+        return {"name": value.name, "cards": snapshot(shown),
+                "hidden": len(value.cards_on_hand) - len(shown),
+                "total": (value.sum_on_hand() or None) if len(shown) == len(value.cards_on_hand) else None}
+    if hasattr(value, "face"):  # a Card
+        return str(value)
+    return value
+
+
+class JsonRenderer:
+    """one JSON object per event, written out once per decision point"""
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self._lines = []
+
+    def event(self, kind, **fields):
+        line = {"event": kind}
+        for key, value in fields.items():
+            line[key] = snapshot(value)
+        self._lines.append(json.dumps(line, ensure_ascii=False))
+
+    def flush(self):
+        if self._lines:
+            self._lines.append("")
+            self.stream.write("\n".join(self._lines))
+            self.stream.flush()
+            self._lines.clear()
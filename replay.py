@@ -0,0 +1,125 @@
+# seeded sessions whose rounds can be replayed exactly
+import hashlib
+import json
+import random
+
+from blackjackmodify import MIN_BET, Dealer, Player, Poker, RoundEngine, Shoe, decks_for, watch
+from render import NULL
+
+
+def round_seed(seed, number):
+    """the 64-bit seed of round `number` in the session seeded with `seed`"""
+    digest = hashlib.blake2b(f'{seed}:{number}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class Recording:
+    """a strategy that passes every question on and keeps the answers in order"""
+
+    def __init__(self, strategy, answers):
+        self.strategy = strategy
+        self.answers = answers
+
+    def watch(self, host):
+        watch(self.strategy, host)
+
+    def choose(self, player, hand, options):
+        self.answers.append(self.strategy.choose(player, hand, options))
+        return self.answers[-1]
+
+    def hit_again(self, player, hand):
+        self.answers.append(self.strategy.hit_again(player, hand))
+        return self.answers[-1]
+
+    def insure(self, player):
+        self.answers.append(self.strategy.insure(player))
+        return self.answers[-1]
+
+    def rebuy(self, player):
+        self.answers.append(self.strategy.rebuy(player))
+        return self.answers[-1]
+
+
+class Replayed:
+    """answers the questions from a recorded list"""
+
+    def __init__(self, answers):
+        self._answers = iter(answers)
+
+    def answer(self, *question):
+        return next(self._answers)
+
+    choose = hit_again = insure = rebuy = answer
+
+
+class Session:
+    """rounds played on one table, each with its own seed and its recorded decisions
+
+    a round starting on a fresh deck (every round of a single Poker, or the first
+    round after a shoe's cut card) only needs its seed, its starting bets and the
+    decisions to be played again; rounds later in a shoe are reached by replaying
+    from the round that started the shoe, without rendering
+    """
+
+    def __init__(self, seed, names=("player 1", "player 2", "player 3"), bet=MIN_BET, decks=None, penetration=0.75):
+        self.seed = seed
+        self.names = list(names)
+        self.bet = bet
+        self.decks = decks  # None for one Poker, as many decks as the seats need, shuffled every round
+        self.penetration = penetration
+        self.rounds = []  # (seed, fresh deck, bets at the start, answers) of every round played
+        self.rng = random.Random()
+        deck = Poker(self.rng, decks_for(len(self.names))) if decks is None else Shoe(decks, penetration, self.rng)
+        self.players = [Player(name, bet) for name in self.names]
+        self.engine = RoundEngine(deck, self.players, Dealer("host"), None)
+
+    def _play(self, seed, fresh, answers_from, renderer):
+        if fresh:
+            self.engine.deck.reset()
+        self.rng.seed(seed)
+        self.engine.strategy = answers_from
+        self.engine.renderer = renderer if renderer is not None else NULL
+        return self.engine.play()
+
+    def play(self, strategy, renderer=None):
+        """play the next round, remembering what is needed to replay it"""
+        deck = self.engine.deck
+        fresh = not self.rounds or not isinstance(deck, Shoe) or deck.must_shuffle(self.engine.needed)
+        seed = round_seed(self.seed, len(self.rounds))
+        bets = [player.all_bets for player in self.players]
+        answers = []
+        result = self._play(seed, fresh, Recording(strategy, answers), renderer)
+        self.rounds.append((seed, fresh, bets, answers))
+        return result
+
+    def replay(self, number, renderer=None):
+        """play round `number` again on a new table, return that table and the round's result
+
+        only round `number` is shown, the rounds before it are fast-forwarded
+        """
+        start = number
+        while not self.rounds[start][1]:
+            start -= 1
+        twin = Session(self.seed, self.names, self.bet, self.decks, self.penetration)
+        for player, bet in zip(twin.players, self.rounds[start][2]):
+            player.bet = bet
+        for seed, fresh, bets, answers in self.rounds[start:number]:
+            twin._play(seed, fresh, Replayed(answers), None)
+        seed, fresh, bets, answers = self.rounds[number]
+        result = twin._play(seed, fresh, Replayed(answers), renderer)
+        twin.rounds = self.rounds[:number + 1]
+        return twin, result
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"seed": self.seed, "names": self.names, "bet": self.bet, "decks": self.decks,
+                       "penetration": self.penetration, "rounds": self.rounds}, f)
+
+    @classmethod
+    def load(cls, path):
+        """a session holding the saved rounds, ready to replay them"""
+        with open(path) as f:
+            saved = json.load(f)
+        session = cls(saved["seed"], saved["names"], saved["bet"], saved["decks"], saved["penetration"])
+        session.rounds = [tuple(each) for each in saved["rounds"]]
+        return session
@@ -0,0 +1,79 @@
+# random numbers for the decks: a numpy Generator handing out shuffles made in batches
+import numpy as np
+
+
+class NumpyRng:
+    """shuffle() and randrange() for Poker and Shoe, drawn from a numpy Generator
+
+    shuffles are drawn `batch` permutations at a time in one call, and randrange()
+    reads from a batch of uniform floats, so each costs an index instead of a call
+    into the generator. streams made by spawn() never share state.
+    """
+
+    def __init__(self, seed=None, batch=1024):
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+        self.batch = batch
+        self._orders = {}  # deck size -> [permutations, next one to use, generator state they were drawn from]
+        self._floats = []
+        self._next_float = 0
+        self._floats_from = None  # generator state the floats were drawn from
+
+    def spawn(self, count):
+        """independent streams, e.g. one for each worker or table"""
+        return [NumpyRng(child, self.batch) for child in self.seed_sequence.spawn(count)]
+
+    def shuffle(self, cards):
+        """put the bytearray of cards in a random order"""
+        size = len(cards)
+        orders = self._orders.get(size)
+        if orders is None or orders[1] == len(orders[0]):
+            drawn_from = self.generator.bit_generator.state
+            orders = self._orders[size] = [self._permutations(size), 0, drawn_from]
+        order = orders[0][orders[1]]
+        orders[1] += 1
+        cards[:] = np.frombuffer(bytes(cards), dtype=np.uint8)[order].tobytes()
+
+    def _permutations(self, size):
+        return self.generator.permuted(np.tile(np.arange(size), (self.batch, 1)), axis=1)
+
+    def _refill(self):
+        self._floats_from = self.generator.bit_generator.state
+        self._floats = self.generator.random(self.batch * 64).tolist()
+        self._next_float = 0
+
+    def randrange(self, start, stop):
+        index = self._next_float
+        if index == len(self._floats):
+            self._refill()
+            index = 0
+        self._next_float = index + 1
+        return start + int(self._floats[index] * (stop - start))
+
+    def getstate(self):
+        """everything needed to go on with the same numbers, see setstate()
+
+        the batches are not kept, only the generator states they were drawn
+        from, so the state stays a few hundred bytes
+        """
+        return {"bit_generator": self.generator.bit_generator.state, "batch": self.batch,
+                "orders": {size: (orders[2], orders[1]) for size, orders in self._orders.items()},
+                "floats": (self._floats_from, self._next_float)}
+
+    def setstate(self, state):
+        self.batch = state["batch"]
+        self._orders = {}
+        for size, (drawn_from, used) in state["orders"].items():  # draw the batches again
+            self.generator.bit_generator.state = drawn_from
+            self._orders[size] = [self._permutations(size), used, drawn_from]
+        self._floats_from, self._next_float = state["floats"]
+        self._floats = []
+        if self._floats_from is not None:
+            self.generator.bit_generator.state = self._floats_from
+            self._floats = self.generator.random(self.batch * 64).tolist()
+        self.generator.bit_generator.state = state["bit_generator"]
+
+
+def streams(seed, count, batch=1024):
+    """`count` independent NumpyRng streams from one seed"""
+    return NumpyRng(seed, batch).spawn(count)
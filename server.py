@@ -0,0 +1,216 @@
+# asyncio table server: many tables in one event loop, seats answer over TCP
+#
+# line protocol, one message per line:
+#   client: join [table]                   sit at the table, or at any table with a free seat
+#   server: seat <table> <seat> | full
+#   server: show <text>                     what the console game would print
+#   server: ask <id> choose <opt>,<opt>..   also: ask <id> hit_again | insure | rebuy
+#   client: <id> <answer>                   an option, yes|no, or the whole amount to add
+#   server: timeout <id>                    no answer in time, defaulted as stand/no
+import argparse
+import asyncio
+import itertools
+
+from blackjackmodify import MIN_BET, Dealer, Player, RoundEngine, Shoe, decks_for
+from render import TextRenderer
+from rng import streams
+
+DEFAULTS = {"choose": "stand", "hit_again": "no", "insure": "no", "rebuy": "0"}
+BACKLOG = 1 << 20  # bytes a seat may have waiting to be sent before it is dropped
+
+
+def convert(kind, answer):
+    """the answer text as RoundEngine wants it"""
+    answer = answer.strip().lower()
+    if kind == "choose":
+        return answer
+    if kind == "rebuy":
+        return int(answer) * 100 if answer.isdigit() else 0  # in cents
+    return answer == "yes"
+
+
+class Broadcast(TextRenderer):
+    """the console text, sent to every seat of the table at each flush"""
+
+    def __init__(self, table):
+        super().__init__()
+        self.table = table
+
+    def flush(self):
+        for line in self._lines:
+            self.table.broadcast(line)
+        self._lines.clear()
+
+
+class Seat:
+    """one connection sitting at a table"""
+
+    def __init__(self, player, writer):
+        self.player = player
+        self.writer = writer
+        self.answers = asyncio.Queue()
+        self.connected = True
+
+    def send(self, line):
+        if not self.connected:
+            return
+        if self.writer.is_closing() or self.writer.transport.get_write_buffer_size() > BACKLOG:
+            self.drop()
+            return
+        self.writer.write(f'{line}\n'.encode())
+
+    def drop(self):
+        """stop sending to a client that has gone or does not read, listen() then ends"""
+        self.connected = False
+        self.writer.transport.abort()
+
+    async def drain(self, timeout):
+        """wait until the client has taken what was sent, drop it if it does not in time"""
+        if not self.connected:
+            return
+        try:
+            async with asyncio.timeout(timeout):
+                await self.writer.drain()
+        except (TimeoutError, ConnectionError):
+            self.drop()
+
+    async def listen(self, reader):
+        """queue every line from the client until it leaves"""
+        try:
+            while line := await reader.readline():
+                self.answers.put_nowait(line.decode())
+        except ConnectionError:  # gone without closing
+            pass
+        self.connected = False
+        self.answers.put_nowait(None)
+        self.writer.close()
+
+
+class Table:
+    """one dealer and its seats, playing rounds for as long as anyone sits"""
+
+    def __init__(self, number, seats=7, timeout=10.0, decks=6, pause=1.0, rng=None):
+        self.number = number
+        self.seats = [None] * seats
+        self.timeout = timeout  # seconds a seat has for each decision
+        self.pause = pause  # seconds between rounds
+        decks = max(decks, decks_for(seats))  # a full table must not run out of cards in a round
+        self.engine = RoundEngine(Shoe(decks, 0.75, rng), [], Dealer("host"), None, renderer=Broadcast(self))
+        self.seated = asyncio.Event()
+        self._ids = itertools.count(1)
+        self._seat_of = {}  # id(player) -> Seat
+
+    @property
+    def free(self):
+        return None in self.seats
+
+    def sit(self, writer):
+        number = self.seats.index(None)
+        seat = self.seats[number] = Seat(Player(f'table {self.number} seat {number + 1}', MIN_BET), writer)
+        self._seat_of[id(seat.player)] = seat
+        seat.send(f'seat {self.number} {number + 1}')
+        self.seated.set()
+        return seat
+
+    def leave(self):
+        """free the seats whose client has gone"""
+        for number, seat in enumerate(self.seats):
+            if seat and not seat.connected:
+                del self._seat_of[id(seat.player)]
+                self.seats[number] = None
+
+    def broadcast(self, message):
+        line = "show " + message.replace("\n", " ")
+        for seat in self.seats:
+            if seat:
+                seat.send(line)
+
+    async def drain(self):
+        await asyncio.gather(*(seat.drain(self.timeout) for seat in self.seats if seat))
+
+    async def ask(self, question):
+        """send the question to the seat and wait for the answer, or the default on timeout"""
+        kind, player = question[0], question[1]
+        seat = self._seat_of[id(player)]
+        number = next(self._ids)
+        seat.send(f'ask {number} {kind}' + (f' {",".join(question[3])}' if kind == "choose" else ""))
+        await self.drain()
+        try:
+            async with asyncio.timeout(self.timeout):
+                while seat.connected:
+                    line = await seat.answers.get()
+                    if line is None:
+                        break
+                    answer_to, _, answer = line.partition(" ")
+                    if answer_to == str(number):  # anything else is a late answer to an earlier question
+                        return convert(kind, answer)
+        except TimeoutError:
+            pass
+        seat.send(f'timeout {number}')
+        return convert(kind, DEFAULTS[kind])
+
+    async def play(self):
+        """one round, with the same rules as the console game"""
+        steps = self.engine.decisions()
+        try:
+            question = next(steps)
+            while True:
+                question = steps.send(await self.ask(question))
+        except StopIteration as end:
+            return end.value
+
+    async def run(self):
+        while True:
+            await self.seated.wait()
+            self.leave()
+            self.engine.players = [seat.player for seat in self.seats if seat]
+            if not self.engine.players:
+                self.seated.clear()
+                continue
+            await self.play()
+            await self.drain()
+            await asyncio.sleep(self.pause)
+
+
+class TableServer:
+    """hosts the tables and seats new connections"""
+
+    def __init__(self, tables=100, seats=7, timeout=10.0, decks=6, pause=1.0, seed=None):
+        # every table deals from its own stream, none share the state of the random module
+        self.tables = [Table(number, seats, timeout, decks, pause, rng)
+                       for number, rng in enumerate(streams(seed, tables), 1)]
+
+    def find(self, wanted):
+        """the wanted table if it has a free seat, else the first table that has one"""
+        if wanted.isdigit() and 0 < int(wanted) <= len(self.tables) and self.tables[int(wanted) - 1].free:
+            return self.tables[int(wanted) - 1]
+        return next((table for table in self.tables if table.free), None)
+
+    async def handle(self, reader, writer):
+        command, _, wanted = (await reader.readline()).decode().strip().partition(" ")
+        table = self.find(wanted) if command == "join" else None
+        if table is None:
+            writer.write(b"full\n")
+            writer.close()
+            return
+        await table.sit(writer).listen(reader)
+
+    async def serve(self, host="127.0.0.1", port=8021):
+        server = await asyncio.start_server(self.handle, host, port)
+        runners = [asyncio.create_task(table.run()) for table in self.tables]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for runner in runners:
+                runner.cancel()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="serve blackjack tables over TCP")
+    parser.add_argument("--port", type=int, default=8021)
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--seats", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds for each decision")
+    args = parser.parse_args()
+    asyncio.run(TableServer(args.tables, args.seats, args.timeout).serve(port=args.port))
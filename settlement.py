@@ -0,0 +1,86 @@
+# settling hands from a payout table, all money in integer cents
+from enum import IntEnum
+from itertools import product
+
+
+class Outcome(IntEnum):
+    """how one hand ended against the host"""
+    LOST = 0
+    DRAW = 1
+    WIN = 2
+    WIN_21 = 3  # any 21 that beats the host pays 3:2 at this table
+    HOST_BLACKJACK = 4  # lost to a natural 21 of the host
+
+
+ORDINALS = ("first", "second", "third", "fourth")  # names of a player's hands after splits
+
+# the name lists RoundEngine.play() returns for each outcome
+BUCKETS = {Outcome.LOST: "lost", Outcome.DRAW: "draw", Outcome.WIN: "bigger_than_host",
+           Outcome.WIN_21: "win_with_21", Outcome.HOST_BLACKJACK: "lost"}
+
+
+def money(cents):
+    """cents shown in whole units when they can be"""
+    if cents % 100 == 0:
+        return str(cents // 100)
+    return f'{cents / 100:.2f}'
+
+
+INSURANCE_PAYS = 3  # on a host blackjack the insurance comes back with 2 times of it, otherwise it is lost
+
+
+def payout(outcome, surrendered):
+    """(numerator, denominator) of the bet paid back"""
+    if surrendered:
+        return 1, 2  # lost half of the bet
+    if outcome == Outcome.WIN_21:
+        return 5, 2
+    if outcome == Outcome.WIN:
+        return 2, 1
+    if outcome == Outcome.DRAW:
+        return 1, 1
+    return 0, 1
+
+
+# keyed by (outcome, surrendered)
+PAYOUT = {key: payout(*key) for key in product(Outcome, (False, True))}
+
+
+def outcome_of(total, host_total):
+    """the outcome of a hand that played on; a total of False is bust, for the host too"""
+    if not total:
+        return Outcome.LOST
+    if not host_total or total > host_total:
+        return Outcome.WIN_21 if total == 21 else Outcome.WIN
+    if total == host_total:
+        return Outcome.DRAW
+    return Outcome.LOST
+
+
+def settle(players, outcomes, result, host_blackjack=False):
+    """pay every seat and split hand in one pass
+
+    outcomes[i] holds the Outcome of each hand of players[i]; the name of every hand
+    not surrendered goes to its list in result. insurance is paid when host_blackjack,
+    to a seat with a natural too
+    """
+    insurance = INSURANCE_PAYS if host_blackjack else 0
+    for player, hands in zip(players, outcomes):
+        insured = bool(player.insurance)
+        surrendered = player.have_surrender
+        split = player.have_split
+        for index, (hand, outcome) in enumerate(zip(player.hands, hands)):
+            numerator, denominator = PAYOUT[outcome, surrendered]
+            hand.bet = hand.bet * numerator // denominator
+            hand.outcome = outcome
+            if index == 0:
+                hand.bet += player.insurance * insurance
+            if split:
+                result[BUCKETS[outcome]].append(f'{player.name}\'s {ORDINALS[index]} hand')
+        if split:
+            continue
+        if insured and host_blackjack and hands[0] == Outcome.HOST_BLACKJACK:
+            result["draw"].append(player.name)  # the insurance paid back what the bet lost
+        elif not surrendered:
+            result[BUCKETS[hands[0]]].append(player.name)
+    return result
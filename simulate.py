@@ -0,0 +1,164 @@
+# Monte Carlo runner: plays RoundEngine rounds over a process pool
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import checkpoint as checkpoints
+from blackjackmodify import MIN_BET, Dealer, MimicDealer, Player, RoundEngine, Shoe, decks_for
+from stats import RoundStats
+
+CHUNK = 10000  # rounds played on one seeded shoe, the same whatever the worker count
+EVERY = 60.0  # seconds between checkpoints
+
+
+class Rules:
+    """the table the rounds are played on"""
+
+    def __init__(self, decks=6, penetration=0.75, seats=1, bet=MIN_BET):
+        self.decks = decks
+        self.penetration = penetration
+        self.seats = seats
+        self.bet = bet  # every hand starts with this bet, in cents
+
+
+def play_chunk(task):
+    """play one chunk of rounds on its own shoe, return their RoundStats
+
+    with a columns directory every round is also written there as numpy columns,
+    with a log directory as a handlog.HandLog with the cards of each round.
+    with a checkpoint directory the chunk saves where it is there every `every`
+    seconds, and goes on from its last checkpoint if it finds one
+    """
+    rounds, strategy, rules, seed, index, columns, log, numpy_rng, checkpoint, every = task
+    path = saved = None
+    if checkpoint:
+        path = os.path.join(checkpoint, f'chunk{index:05d}.pkl')
+        saved = checkpoints.load(path)
+        run = (rounds, checkpoints.strategy_key(strategy), seed, numpy_rng, rules.decks, rules.penetration,
+               rules.seats, rules.bet, columns, log)
+        if saved is not None and saved["run"] != run:
+            raise ValueError(f'{path} is the checkpoint of another run')
+        if saved is not None and saved["done"]:
+            return saved["stats"]
+    host = Dealer("host")
+    sink = hands = recorder = None
+    if columns:
+        from columns import ColumnSink  # numpy is only needed for the columns
+        sink = ColumnSink(columns, prefix=f'chunk{index:05d}')
+    if log:
+        from handlog import HandLog
+        os.makedirs(log, exist_ok=True)
+        hands = HandLog(os.path.join(log, f'chunk{index:05d}.log'))
+    if sink or hands:
+        from handlog import Recorder
+        strategy = recorder = Recorder(strategy)
+    if numpy_rng:
+        from numpy.random import SeedSequence
+        from rng import NumpyRng
+        rng = NumpyRng(SeedSequence(seed, spawn_key=(index,)))  # the index-th stream spawned from the seed
+    else:
+        rng = random.Random(f'{seed}:{index}')
+    shoe = Shoe(rules.decks, rules.penetration, rng=rng)
+    players = [Player(f'player {seat + 1}', rules.bet) for seat in range(rules.seats)]
+    engine = RoundEngine(shoe, players, host, strategy)
+    start, stats = index * CHUNK, RoundStats()
+    if saved is not None:
+        start, stats = checkpoints.restore(saved, shoe, players)
+        if sink:
+            sink.setstate(saved["sink"])
+        if hands:
+            hands.setstate(saved["log"])
+    elif path and hands:
+        hands.setstate({"records": 0, "deals": 0})  # starting over, nothing a killed run logged is kept
+    due = time.monotonic() + every if path else None
+    for number in range(start, index * CHUNK + rounds):
+        for each in players:
+            each.reset(rules.bet)
+        stats.add(engine.play(), players, rules.bet)
+        if sink:
+            sink.log_round(number, players, engine.host, recorder)
+        if hands:
+            hands.log_round(number, seed, players, engine.host, recorder, shoe.dealt_since(engine.round_start))
+        if recorder:
+            recorder.clear()
+        if due is not None and time.monotonic() >= due:
+            checkpoints.save(path, checkpoints.capture(number + 1, shoe, players, stats, run=run, done=False,
+                                                       sink=sink.getstate() if sink else None,
+                                                       log=hands.getstate() if hands else None))
+            due = time.monotonic() + every
+    if sink:
+        sink.close()
+    if hands:
+        hands.close()
+    if path:
+        checkpoints.save(path, {"run": run, "done": True, "stats": stats})
+    return stats
+
+
+def merge_chunks(stats, parts, target):
+    """merge the parts in order, return False if the target was met before the last one"""
+    for part in parts:
+        stats.merge(part)
+        if target is not None and stats.returns.half_width <= target:
+            return False
+    return True
+
+
+def simulate(rounds, strategy=None, rules=None, workers=1, seed=0, target=None, columns=None, numpy_rng=False,
+             checkpoint=None, every=EVERY, log=None):
+    """play the rounds over the workers and merge their stats into one report
+
+    the rounds are cut into chunks of CHUNK, each seeded from the master seed and its
+    index, so the report for a seed does not depend on the number of workers.
+    with a target, rounds is the most to play: the chunks are merged in order and
+    the run stops after the first one that brings the confidence interval on EV
+    within target of the mean. with columns, every round is also written to that
+    directory (see columns.py), one set of files per chunk, and with log to a hand
+    history per chunk in that directory (see handlog.py). with numpy_rng the shoes
+    deal from rng.NumpyRng streams split from the seed instead of random.Random.
+    with checkpoint, each chunk saves its state in that directory every `every`
+    seconds and when it is done; running again with the same arguments goes on
+    from there and gives the same report as a run never stopped
+    """
+    strategy = strategy if strategy is not None else MimicDealer()
+    rules = rules if rules is not None else Rules()
+    if checkpoint:
+        os.makedirs(checkpoint, exist_ok=True)
+    tasks = [(min(CHUNK, rounds - start), strategy, rules, seed, index, columns, log, numpy_rng, checkpoint, every)
+             for index, start in enumerate(range(0, rounds, CHUNK))]
+    stats = RoundStats()
+    if workers == 1:
+        merge_chunks(stats, map(play_chunk, tasks), target)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if not merge_chunks(stats, pool.map(play_chunk, tasks), target):
+                pool.shutdown(cancel_futures=True)  # chunks not started yet are not needed
+    return stats.report()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="simulate blackjack rounds")
+    parser.add_argument("rounds", type=int)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--target", type=float, help="stop once the EV is known within this, rounds is then the most")
+    parser.add_argument("--columns", help="directory to write every round to as numpy columns")
+    parser.add_argument("--log", help="directory to write every round to as a hand history with its cards")
+    parser.add_argument("--policy", help="a policy file from policy.py to play, instead of MimicDealer")
+    parser.add_argument("--numpy-rng", action="store_true", help="deal from numpy streams split from the seed")
+    parser.add_argument("--checkpoint", help="directory to save the run in as it goes, and to go on from")
+    parser.add_argument("--every", type=float, default=EVERY, help="seconds between checkpoints")
+    args = parser.parse_args()
+    if args.decks < decks_for(args.seats):
+        parser.error(f'{args.seats} seats need at least {decks_for(args.seats)} decks')
+    strategy = None
+    if args.policy:
+        from policy import Policy
+        strategy = Policy.load(args.policy)
+    print(simulate(args.rounds, strategy, Rules(decks=args.decks, seats=args.seats), workers=args.workers,
+                   seed=args.seed, target=args.target, columns=args.columns, numpy_rng=args.numpy_rng,
+                   checkpoint=args.checkpoint, every=args.every, log=args.log))
@@ -0,0 +1,128 @@
+# streaming statistics: constant memory however many rounds are played
+import math
+
+Z = 1.96  # 95% confidence
+
+
+class Moments:
+    """count, mean and variance updated one value at a time (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared distances from the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """take in the values of another Moments (Chan's parallel update)"""
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def half_width(self):
+        """half the width of the confidence interval on the mean"""
+        if self.count < 2:
+            return math.inf
+        return Z * math.sqrt(self.variance / self.count)
+
+
+class Histogram:
+    """counts of values in fixed bins between low and high, plus below and above"""
+
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.high = high
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.below = 0
+        self.above = 0
+
+    def add(self, value):
+        if value < self.low:
+            self.below += 1
+        elif value >= self.high:
+            self.above += 1
+        else:
+            self.counts[min(int((value - self.low) / self.width), len(self.counts) - 1)] += 1
+
+    def merge(self, other):
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.below += other.below
+        self.above += other.above
+        return self
+
+    def bins(self):
+        """(start of the bin, count) of every bin"""
+        return [(self.low + index * self.width, count) for index, count in enumerate(self.counts)]
+
+
+class RoundStats:
+    """everything a long run reports, kept in constant memory
+
+    returns are the net of a round over its seats, in bets per seat; the bankroll
+    is the sum of the returns so far, starting from 0 on every chunk
+    """
+
+    def __init__(self):
+        self.returns = Moments()
+        self.return_histogram = Histogram(-2, 3, 20)
+        self.bankroll_histogram = Histogram(-500, 500, 40)
+        self.bankroll = 0.0
+        self.hands = 0
+        self.busts = 0
+        self.surrenders = 0
+        self.net = 0  # in cents
+        self.outcomes = {"win_with_21": 0, "bigger_than_host": 0, "lost": 0, "draw": 0}
+
+    def add(self, result, players, bet):
+        """count one round from what play() returned and the players after it"""
+        for bucket, names in result.items():
+            self.outcomes[bucket] += len(names)
+        net = 0
+        for each in players:
+            self.hands += len(each.hands)
+            self.busts += sum(hand.bust for hand in each.hands)
+            self.surrenders += each.have_surrender
+            net += each.net
+        self.net += net
+        value = net / (len(players) * bet)
+        self.returns.add(value)
+        self.return_histogram.add(value)
+        self.bankroll += value
+        self.bankroll_histogram.add(self.bankroll)
+
+    def merge(self, other):
+        self.returns.merge(other.returns)
+        self.return_histogram.merge(other.return_histogram)
+        self.bankroll_histogram.merge(other.bankroll_histogram)
+        self.hands += other.hands
+        self.busts += other.busts
+        self.surrenders += other.surrenders
+        self.net += other.net
+        for bucket in self.outcomes:
+            self.outcomes[bucket] += other.outcomes[bucket]
+        return self
+
+    def report(self):
+        outcomes = self.outcomes
+        return {"rounds": self.returns.count, "hands": self.hands,
+                "win": outcomes["win_with_21"] + outcomes["bigger_than_host"],
+                "loss": outcomes["lost"], "push": outcomes["draw"], "bust": self.busts,
+                "surrender": self.surrenders, "net": self.net, "ev": self.returns.mean,
+                "ev_ci": self.returns.half_width, "variance": self.returns.variance,
+                "bust_rate": self.busts / self.hands if self.hands else 0.0, "outcomes": dict(outcomes)}
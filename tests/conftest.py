@@ -0,0 +1,43 @@
+# the modules sit at the top of the repository, next to this folder
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blackjackmodify import MIN_BET, NEW_DECK  # noqa: E402
+from compare import Stacked  # noqa: E402
+
+TWO = next(code for code in NEW_DECK if code & 0x0F == 2)
+
+
+class SplitAndHit:
+    """split every pair, hit everything else to the last card"""
+
+    def choose(self, player, hand, options):
+        return "split" if "split" in options else "hit"
+
+    def hit_again(self, player, hand):
+        return True
+
+    def insure(self, player):
+        return False
+
+    def rebuy(self, player):
+        return MIN_BET
+
+
+@pytest.fixture
+def split_and_hit():
+    return SplitAndHit()
+
+
+@pytest.fixture
+def all_twos():
+    """a deck of the given decks dealing nothing but twos, so every seat splits into four 5-card hands"""
+    def stacked(decks):
+        deck = Stacked(decks)
+        deck.stack(bytes([TWO]) * len(deck.cards))
+        return deck
+    return stacked
@@ -0,0 +1,106 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+import checkpoint
+from blackjackmodify import MimicDealer, Shoe
+from columns import load
+from handlog import SPLIT
+from policy import basic, compile_policy, mimic
+from simulate import Rules, play_chunk
+
+ROUNDS = 400
+RULES = Rules(decks=4, seats=2)
+BASIC = compile_policy(basic)
+
+
+class Killed(Exception):
+    pass
+
+
+class Killer:
+    """the basic policy, dying at a random decision as if the process were killed"""
+
+    def __init__(self, rng):
+        self.policy = BASIC
+        self.left = rng.randint(1, 40)
+
+    def watch(self, host):
+        self.policy.watch(host)
+
+    def choose(self, player, hand, options):
+        self.left -= 1
+        if not self.left:
+            raise Killed
+        return self.policy.choose(player, hand, options)
+
+    def hit_again(self, player, hand):
+        return self.policy.hit_again(player, hand)
+
+    def insure(self, player):
+        return self.policy.insure(player)
+
+    def rebuy(self, player):
+        return self.policy.rebuy(player)
+
+
+def test_save_is_atomic_and_load_gives_it_back(tmp_path):
+    path = str(tmp_path / "state.pkl")
+    assert checkpoint.load(path) is None
+    checkpoint.save(path, {"round": 1})
+    checkpoint.save(path, {"round": 2})
+    assert checkpoint.load(path) == {"round": 2}
+    assert os.listdir(tmp_path) == ["state.pkl"]
+
+
+def test_deck_state_goes_on_the_same():
+    shoe = Shoe(2, rng=random.Random(3))
+    for _ in range(40):
+        shoe.next
+    state = shoe.getstate()
+    dealt = [str(shoe.next) for _ in range(30)]
+    again = Shoe(2, rng=random.Random(9))
+    again.setstate(state)
+    assert [str(again.next) for _ in range(30)] == dealt
+    assert again.running_count == shoe.running_count and again.rank_counts == shoe.rank_counts
+
+
+@pytest.mark.parametrize("numpy_rng", [False, True])
+def test_killed_and_resumed_run_matches_one_never_stopped(tmp_path, numpy_rng):
+    straight = play_chunk((ROUNDS, BASIC, RULES, 7, 0, str(tmp_path / "straight"), str(tmp_path / "straight"),
+                           numpy_rng, None, 0.0))
+    columns, saved = str(tmp_path / "columns"), str(tmp_path / "checkpoints")
+    os.makedirs(saved)
+    rng = random.Random(1)
+    resumed_after = []  # the rounds finished just before each kill
+    while True:
+        try:
+            stopped = play_chunk((ROUNDS, Killer(rng), RULES, 7, 0, columns, columns, numpy_rng, saved, 0.0))
+            break
+        except Killed:
+            state = checkpoint.load(os.path.join(saved, "chunk00000.pkl"))
+            if state is not None:
+                resumed_after.append(state["round"] - 1)
+    assert stopped.report() == straight.report()
+    assert stopped.returns.__dict__ == straight.returns.__dict__
+
+    expected, got = load(str(tmp_path / "straight")), load(columns)
+    for name in expected:
+        assert np.array_equal(np.concatenate(expected[name]), np.concatenate(got[name]))
+    for name in ("chunk00000.log", "chunk00000.log.deals"):
+        with open(tmp_path / "straight" / name, "rb") as f, open(os.path.join(columns, name), "rb") as g:
+            assert f.read() == g.read()
+    rounds, flags = np.concatenate(expected["round"]), np.concatenate(expected["flags"])
+    split_rounds = set(rounds[flags & SPLIT != 0].tolist())
+    assert split_rounds & set(resumed_after)  # some runs went on right after a split round
+
+
+def test_checkpoint_of_another_strategy_is_refused(tmp_path):
+    saved = str(tmp_path)
+    play_chunk((50, BASIC, RULES, 7, 0, None, None, False, saved, 0.0))
+    for other in (compile_policy(mimic), MimicDealer()):
+        with pytest.raises(ValueError):
+            play_chunk((50, other, RULES, 7, 0, None, None, False, saved, 0.0))
+    play_chunk((50, compile_policy(basic), RULES, 7, 0, None, None, False, saved, 0.0))  # the same tables go on
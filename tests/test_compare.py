@@ -0,0 +1,27 @@
+import random
+
+from blackjackmodify import NEW_DECK, MimicDealer
+from compare import Table, compare
+from policy import basic, compile_policy
+from simulate import Rules
+
+
+def test_rounds_after_a_split_start_from_the_rules_bet():
+    rules = Rules(decks=1, seats=2)
+    table = Table(compile_policy(basic), rules)
+    rng = random.Random(0)
+    order = bytearray(NEW_DECK)
+    splits = 0
+    for _ in range(3000):
+        rng.shuffle(order)
+        table.play(bytes(order))
+        for each in table.players:
+            splits += each.have_split
+            assert each.staked <= 2 * rules.bet * len(each.hands) + each.insurance
+    assert splits
+
+
+def test_same_strategy_twice_differs_by_nothing():
+    first, second = compare([MimicDealer(), MimicDealer()], 500, Rules(decks=1), seed=1)
+    assert second["difference"] == 0.0
+    assert first["ev"] == second["ev"]
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from blackjackmodify import MAX_CARDS, MAX_HANDS, MIN_BET, SEAT_CARDS, Dealer, Player, Poker, RoundEngine, Shoe, decks_for
+
+def test_a_seat_may_take_every_card_of_every_hand():
+    assert SEAT_CARDS == MAX_HANDS * MAX_CARDS
+
+
+@pytest.mark.parametrize("seats", range(1, 8))
+def test_decks_for_fits_the_table(seats):
+    needed = seats * SEAT_CARDS + 5
+    assert Poker(decks=decks_for(seats)).capacity >= needed
+    assert Shoe(decks_for(seats)).capacity >= needed
+
+
+@pytest.mark.parametrize("seats", range(1, 8))
+def test_round_of_only_twos_does_not_run_out(seats, all_twos, split_and_hit):
+    deck = all_twos(decks_for(seats))
+    players = [Player(f'player {seat + 1}', MIN_BET) for seat in range(seats)]
+    RoundEngine(deck, players, Dealer("host"), split_and_hit).play()
+    for each in players:
+        assert len(each.hands) == MAX_HANDS
+        assert all(len(hand) == MAX_CARDS for hand in each.hands)
+
+
+def test_engine_refuses_a_deck_too_small_for_the_table(split_and_hit):
+    players = [Player(f'player {seat + 1}', MIN_BET) for seat in range(3)]
+    with pytest.raises(ValueError):
+        RoundEngine(Poker(), players, Dealer("host"), split_and_hit).play()
+    with pytest.raises(ValueError):
+        RoundEngine(Shoe(1), players, Dealer("host"), split_and_hit).play()
+
+
+def test_shoe_reshuffles_before_a_round_that_could_run_out(split_and_hit):
+    # 7 seats may take 145 cards: a 6-deck shoe reshuffles early instead of refusing
+    shoe = Shoe(6, rng=random.Random(5))
+    players = [Player(f'player {seat + 1}', MIN_BET) for seat in range(7)]
+    engine = RoundEngine(shoe, players, Dealer("host"), split_and_hit)
+    early = 0
+    for _ in range(200):
+        fresh = shoe.must_shuffle(engine.needed)
+        early += fresh and not shoe.cut_card_out
+        engine.play()
+        dealt = sum(len(hand) for each in players for hand in each.hands) + len(engine.host.cards_on_hand)
+        if fresh:
+            assert shoe.remaining == shoe.capacity - dealt
+        for each in players:
+            each.reset(MIN_BET)
+    assert early
@@ -0,0 +1,140 @@
+from blackjackmodify import MIN_BET, NEW_DECK, Dealer, Player, RoundEngine, encode
+from compare import Stacked
+
+
+class Answers:
+    """answers given in turn, remembering the options each choice offered"""
+
+    def __init__(self, choices=(), hit_again=(), insure=(), rebuy=MIN_BET):
+        self.choices = list(choices)
+        self.hits = list(hit_again)
+        self.insures = list(insure)
+        self.rebuys = rebuy
+        self.offered = []
+
+    def choose(self, player, hand, options):
+        self.offered.append(options)
+        return self.choices.pop(0)
+
+    def hit_again(self, player, hand):
+        return self.hits.pop(0)
+
+    def insure(self, player):
+        return self.insures.pop(0)
+
+    def rebuy(self, player):
+        return self.rebuys
+
+
+def play(faces, answers, seats=1, bet=MIN_BET):
+    """one round on a deck dealing these faces first: a card to every seat, the host, again, then the rest"""
+    deck = Stacked()
+    top = bytes(encode("♠", face) for face in faces)
+    deck.stack(top + NEW_DECK[len(top):])
+    players = [Player(f'player {seat + 1}', bet) for seat in range(seats)]
+    host = Dealer("host")
+    result = RoundEngine(deck, players, host, answers).play()
+    return players, host, result
+
+
+def test_player_natural_pays_three_to_two():
+    players, host, result = play([1, 9, 13, 7], Answers())
+    assert result["win_with_21"] == ["player 1"]
+    assert players[0].net == MIN_BET * 3 // 2
+
+
+def test_host_natural_with_ten_up_takes_the_bet_without_asking():
+    answers = Answers()
+    players, host, result = play([9, 10, 7, 1], answers)
+    assert result["lost"] == ["player 1"] and not answers.offered
+    assert players[0].net == -MIN_BET
+
+
+def test_insured_seat_breaks_even_against_a_host_blackjack():
+    players, host, result = play([9, 1, 7, 13], Answers(insure=[True]))
+    assert result["draw"] == ["player 1"]
+    assert players[0].net == 0
+
+
+def test_insurance_is_lost_when_the_host_has_no_blackjack():
+    players, host, result = play([10, 1, 10, 7], Answers(choices=["stand"], insure=[True]))
+    assert result["bigger_than_host"] == ["player 1"]
+    assert players[0].net == MIN_BET - MIN_BET // 2
+
+
+def test_every_seat_is_asked_about_insurance_before_naturals_are_settled():
+    # player 1 has a natural, the host shows an Ace over a 10, player 2 insures a 16
+    answers = Answers(insure=[False, True])
+    players, host, result = play([1, 9, 1, 13, 7, 13], answers, seats=2)
+    assert answers.insures == []
+    assert result["draw"] == ["player 1", "player 2"]
+    assert players[0].net == 0 and players[1].net == 0
+
+
+def test_both_naturals_draw():
+    players, host, result = play([1, 1, 13, 13], Answers(insure=[False]))
+    assert result["draw"] == ["player 1"] and players[0].net == 0
+
+
+def test_host_draws_to_17_and_busts():
+    # host 6 and 10, draws the 10 and busts
+    players, host, result = play([10, 6, 8, 10, 10], Answers(choices=["stand"]))
+    assert len(host.cards_on_hand) == 3 and not host.sum_on_hand()
+    assert result["bigger_than_host"] == ["player 1"]
+
+
+def test_double_down_takes_one_card_for_twice_the_bet():
+    players, host, result = play([5, 10, 6, 8, 10], Answers(choices=["double down"]))
+    assert len(players[0].hand) == 3 and players[0].staked == 2 * MIN_BET
+    assert result["win_with_21"] == ["player 1"]  # any 21 that beats the host pays 3:2
+    assert players[0].net == 3 * MIN_BET
+
+
+def test_surrender_only_on_the_first_two_cards_and_halves_the_loss():
+    answers = Answers(choices=["surrender"])
+    players, host, result = play([10, 10, 6, 8], answers)
+    assert "surrender" in answers.offered[0]
+    assert players[0].net == -MIN_BET // 2
+    assert not any(result.values())
+
+
+def test_bust_loses_whatever_the_host_has():
+    players, host, result = play([10, 10, 6, 6, 9], Answers(choices=["hit"]))
+    assert result["lost"] == ["player 1"] and players[0].net == -MIN_BET
+
+
+def test_hitting_stops_at_five_cards():
+    answers = Answers(choices=["hit"], hit_again=[True, True])
+    players, host, result = play([2, 10, 2, 8, 2, 2, 2], answers)
+    assert len(players[0].hand) == 5 and answers.hits == []
+
+
+def test_split_plays_each_hand_with_its_own_bet():
+    # the 8s are split and take a 10 and a 9, both stand on 18 and 17 against the host's 18
+    answers = Answers(choices=["split", "stand", "stand"])
+    players, host, result = play([8, 10, 8, 8, 10, 9], answers)
+    assert "split" in answers.offered[0] and "surrender" not in answers.offered[1]
+    assert [len(hand) for hand in players[0].hands] == [2, 2]
+    assert players[0].staked == 2 * MIN_BET
+    assert result["draw"] == ["player 1's first hand"] and result["lost"] == ["player 1's second hand"]
+    assert players[0].net == -MIN_BET
+
+
+def test_a_seat_without_a_bet_is_asked_to_rebuy():
+    players, host, result = play([10, 10, 9, 8], Answers(choices=["stand"], rebuy=3 * MIN_BET), bet=0)
+    assert players[0].staked == 3 * MIN_BET
+    assert players[0].net == 3 * MIN_BET
+
+
+def test_a_hand_out_of_money_takes_its_bet_from_another_hand_of_the_owner():
+    deck = Stacked()
+    players = [Player("player 1 hand 1", 0, "player 1"), Player("player 1 hand 2", 3 * MIN_BET, "player 1")]
+    RoundEngine(deck, players, Dealer("host"), Answers(choices=["stand", "stand"], rebuy=None)).play()
+    assert players[0].staked == MIN_BET and players[1].staked == 2 * MIN_BET
+
+
+def test_the_owner_is_asked_to_rebuy_when_no_hand_can_spare_a_bet():
+    deck = Stacked()
+    players = [Player("player 1 hand 1", 0, "player 1"), Player("player 1 hand 2", MIN_BET, "player 1")]
+    RoundEngine(deck, players, Dealer("host"), Answers(choices=["stand", "stand"], rebuy=2 * MIN_BET)).play()
+    assert players[0].staked == 2 * MIN_BET and players[1].staked == MIN_BET
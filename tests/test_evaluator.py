@@ -0,0 +1,24 @@
+import random
+
+from blackjackmodify import CARDS, MAX_CARDS, Hand, encode
+from evaluator import evaluate, to_ranks
+
+
+def hand_of(faces):
+    hand = Hand()
+    for face in faces:
+        hand.add(CARDS[encode("♠", face)])
+    return hand
+
+
+def test_evaluate_agrees_with_hand_total():
+    rng = random.Random(2)
+    faces = [[rng.randint(1, 13) for _ in range(rng.randint(0, MAX_CARDS))] for _ in range(3000)]
+    hands = [hand_of(each) for each in faces + [[1, 13], [13, 1], [1, 1, 9], [7, 7, 7], [10, 10, 2]]]
+    hard, soft, bust, natural = evaluate(to_ranks([hand[:len(hand)] for hand in hands]))
+    for row, hand in enumerate(hands):
+        assert hard[row] == hand.hard
+        assert bust[row] == hand.bust
+        assert (not bust[row] and soft[row]) == hand.total  # Hand.total is False when bust
+        assert natural[row] == (len(hand) == 2 and hand.total == 21)
+    assert natural.sum() >= 2 and bust.any()
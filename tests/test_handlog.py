@@ -0,0 +1,75 @@
+import pytest
+
+from blackjackmodify import MIN_BET, Dealer, Player, RoundEngine, decks_for
+from compare import Stacked
+from handlog import INSURANCE, MAX_ACTIONS, NAMES, SPLIT, HandLog, Recorder, pack_cards, read, read_deals
+from policy import basic, compile_policy
+from simulate import Rules, simulate
+
+
+class Logged:
+    """answers each seat from the actions logged for it"""
+
+    def __init__(self, players, records):
+        self.actions = {id(player): iter(code for code in record[5] if code) for player, record in zip(players, records)}
+        self.insured = {id(player): bool(record[6] & INSURANCE) for player, record in zip(players, records)}
+
+    def choose(self, player, hand, options):
+        return NAMES[next(self.actions[id(player)])]
+
+    def hit_again(self, player, hand):
+        return NAMES[next(self.actions[id(player)])] == "hit"
+
+    def insure(self, player):
+        return self.insured[id(player)]
+
+    def rebuy(self, player):
+        return MIN_BET
+
+
+@pytest.fixture
+def played_all_twos(all_twos, split_and_hit):
+    players = [Player("player 1", MIN_BET)]
+    recorder = Recorder(split_and_hit)
+    engine = RoundEngine(all_twos(decks_for(1)), players, Dealer("host"), recorder)
+    engine.play()
+    return players, engine.host, recorder
+
+
+def test_the_most_decisions_of_a_seat_fit_in_a_record(tmp_path, played_all_twos):
+    players, host, recorder = played_all_twos
+    actions = recorder.actions[id(players[0])]
+    assert len(actions) == MAX_ACTIONS
+    path = str(tmp_path / "hands.log")
+    with HandLog(path) as log:
+        log.log_round(1, 2, players, host, recorder)
+    (record,) = read(path)
+    assert record[5] == bytes(actions)
+    assert [NAMES[code] for code in record[5]].count("split") == 3
+
+
+def test_actions_that_do_not_fit_raise(tmp_path, played_all_twos):
+    players, host, recorder = played_all_twos
+    with HandLog(str(tmp_path / "hands.log")) as log:
+        with pytest.raises(ValueError):
+            log.write(1, 2, 0, host, players[0], bytes(MAX_ACTIONS + 1))
+
+
+def test_a_logged_round_plays_again_on_its_cards(tmp_path):
+    rules = Rules(decks=4, seats=2)
+    simulate(300, compile_policy(basic), rules, log=str(tmp_path))
+    path = str(tmp_path / "chunk00000.log")
+    records, deals = list(read(path)), dict(read_deals(path))
+    assert sorted(deals) == list(range(300))
+    split = next(record[0] for record in records if record[6] & SPLIT)
+    for number in (0, split, 299):
+        logged = [record for record in records if record[0] == number]
+        deck = Stacked(rules.decks)
+        deck.stack(deals[number] + bytes(deck._cards[len(deals[number]):]))
+        players = [Player(f'player {seat + 1}', rules.bet) for seat in range(rules.seats)]
+        host = Dealer("host")
+        RoundEngine(deck, players, host, Logged(players, logged)).play()
+        for player, record in zip(players, logged):
+            assert record[3] == pack_cards(host.cards_on_hand)
+            assert record[4] == b"".join(pack_cards(hand) for hand in player.hands).ljust(len(record[4]), b"\0")
+            assert list(record[7:7 + len(player.hands)]) == [hand.bet for hand in player.hands]
@@ -0,0 +1,23 @@
+import pytest
+
+from loadtest import kind_of, load_test
+
+
+def test_every_console_prompt_has_a_kind():
+    assert kind_of("please type your decision here:") == "choose"
+    assert kind_of("do you want to hit once more?") == "hit_again"
+    assert kind_of("") == "insure"
+    assert kind_of("how much do you want to add:") == "rebuy"
+    assert kind_of("new game?(yes|no):") == "new_game"
+
+
+def test_unknown_prompt_raises():
+    with pytest.raises(ValueError):
+        kind_of("how many players?")
+
+
+def test_console_game_plays_through():
+    result = load_test(300, seats=4, hands=2, seed=5)
+    assert result["crash"] is None
+    assert result["rounds"] == 300
+    assert result["output_chars"] > 0
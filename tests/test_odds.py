@@ -0,0 +1,70 @@
+import pytest
+
+from blackjackmodify import CARDS, Dealer, RoundEngine, encode
+from odds import dealer_odds
+
+
+class Dealt:
+    """a deck dealing the given cards in turn"""
+
+    def __init__(self, cards):
+        self.cards = iter(cards)
+
+    @property
+    def next(self):
+        return next(self.cards)
+
+
+def card(face):
+    return CARDS[encode("♠", face)]
+
+
+def host_draw_odds(up, counts, no_natural=False):
+    """how RoundEngine.host_draw() ends over every order of the hole card and 3 more cards"""
+    odds = {}
+
+    def deal(faces, weight, left):
+        if len(faces) < 4:
+            for face, count in enumerate(left):
+                if count:
+                    rest = left[:face] + [count - 1] + left[face + 1:]
+                    deal(faces + [face], weight * count / sum(left), rest)
+            return
+        host = Dealer("host")
+        host.get(card(up))
+        host.get(card(faces[0]))
+        if host.natural_21:
+            key = "blackjack"
+        else:
+            RoundEngine(Dealt(card(face) for face in faces[1:]), [], host, None).host_draw()
+            key = host.sum_on_hand() or "bust"
+        odds[key] = odds.get(key, 0.0) + weight
+
+    deal([], 1.0, list(counts))
+    if no_natural:
+        odds = {key: chance / (1 - odds.get("blackjack", 0.0)) for key, chance in odds.items() if key != "blackjack"}
+    return odds
+
+
+def counts_of(**faces):
+    counts = [0] * 14
+    for face, count in faces.items():
+        counts[int(face[1:])] = count
+    return counts
+
+
+@pytest.mark.parametrize("up, counts", [
+    (6, counts_of(f1=3, f2=4, f3=3, f10=3)),  # small cards, the 5 card limit stops the host below 17
+    (1, counts_of(f1=2, f2=3, f5=2, f10=2, f13=2)),  # an Ace up, the host may have a blackjack
+    (10, counts_of(f1=2, f4=3, f6=3, f12=2)),
+])
+@pytest.mark.parametrize("no_natural", [False, True])
+def test_dealer_odds_match_host_draw(up, counts, no_natural):
+    expected = host_draw_odds(up, counts, no_natural)
+    odds = {key: chance for key, chance in dealer_odds(up, counts, no_natural).items() if chance}
+    assert odds == pytest.approx(expected)
+
+
+def test_five_card_limit_leaves_totals_below_17():
+    odds = dealer_odds(6, counts_of(f1=3, f2=4, f3=3, f10=3))
+    assert odds[15] > 0 and odds[15] == pytest.approx(host_draw_odds(6, counts_of(f1=3, f2=4, f3=3, f10=3))[15])
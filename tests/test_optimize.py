@@ -0,0 +1,26 @@
+from handlog import ACTIONS
+from optimize import candidates, changed, evaluate
+from policy import OPTION_SETS, compile_policy, mimic
+from simulate import Rules
+
+
+def test_every_cell_change_is_tried_once():
+    policy = compile_policy(mimic)
+    tried = list(candidates(policy))
+    assert len(tried) == len(set(tried)) == 1148
+
+
+def test_changed_leaves_cells_where_the_action_is_not_offered():
+    policy = compile_policy(mimic)
+    after = changed(policy.choices, policy.insurance, ("choice", (16, 0, 8, 5), "split"))
+    for index, options in enumerate(OPTION_SETS):
+        expected = ACTIONS["split"] if "split" in options else policy.choices[16, 0, 8, 5, index]
+        assert after.choices[16, 0, 8, 5, index] == expected
+    assert (policy.choices[16, 0, 8, 5] == ACTIONS["hit"]).all()
+
+
+def test_hitting_twenty_is_clearly_worse():
+    policy = compile_policy(mimic)
+    candidate, mean, width, played = evaluate((policy.choices, policy.insurance,
+                                               ("choice", (20, 0, 0, 10), "hit"), Rules(decks=1), 500, "test"))
+    assert mean + width < 0
@@ -0,0 +1,26 @@
+import io
+import json
+
+from blackjackmodify import CARDS, MIN_BET, NEW_DECK, Dealer, Player, RoundEngine, encode
+from compare import Stacked
+from render import JsonRenderer
+
+
+class Stand:
+    def choose(self, player, hand, options):
+        return "stand"
+
+
+def test_json_shows_the_hole_card_only_once_the_host_plays():
+    deck = Stacked()
+    top = bytes(encode("♠", face) for face in (10, 9, 7, 8))  # the host has 9 up and 8 in the hole
+    deck.stack(top + NEW_DECK[len(top):])
+    stream = io.StringIO()
+    RoundEngine(deck, [Player("player 1", MIN_BET)], Dealer("host"), Stand(), JsonRenderer(stream)).play()
+    events = [json.loads(line) for line in stream.getvalue().splitlines() if line]
+    hosts = [event["host"] for event in events if event["event"] == "host"]
+    hole = str(CARDS[top[3]])
+    dealt = [host for host in hosts if host["hidden"]]
+    assert dealt and all(host["cards"] == ["♠9"] and host["total"] is None for host in dealt)
+    assert hole not in str(hosts[:hosts.index(dealt[-1]) + 1])
+    assert hosts[-1] == {"name": "host", "cards": ["♠9", hole], "hidden": 0, "total": 17}
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from blackjackmodify import MIN_BET
+from policy import basic, compile_policy
+from replay import Session
+
+
+def test_a_policy_plays_and_replays_a_session():
+    # the engine shows its host to the policy through the Recording around it
+    session = Session(1)
+    played = [session.play(compile_policy(basic)) for _ in range(20)]
+    for number in (0, 7, 19):
+        twin, result = session.replay(number)
+        assert result == played[number]
+
+
+class Random:
+    """answers picked at random, so rounds split, double, surrender, insure and rebuy"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def choose(self, player, hand, options):
+        return self.rng.choice(options)
+
+    def hit_again(self, player, hand):
+        return self.rng.random() < 0.5
+
+    def insure(self, player):
+        return self.rng.random() < 0.5
+
+    def rebuy(self, player):
+        return self.rng.choice((MIN_BET, 2 * MIN_BET))
+
+
+def table(session):
+    """the bets and cards of every seat and the host's cards, as the round left them"""
+    seats = [(player.all_bets, [str(hand[:len(hand)]) for hand in player.hands]) for player in session.players]
+    return seats, str(session.engine.host.cards_on_hand)
+
+
+@pytest.mark.parametrize("decks", [None, 2])  # a Poker shuffled every round, a Shoe dealt to its cut card
+def test_saved_rounds_replay_the_same_after_load(tmp_path, decks):
+    session = Session(3, decks=decks)
+    strategy = Random(4)
+    played = []
+    for _ in range(60):
+        result = session.play(strategy)
+        played.append((result, table(session)))
+    path = str(tmp_path / "session.json")
+    session.save(path)
+    loaded = Session.load(path)
+    for number in random.Random(5).sample(range(60), 12) + [0, 59]:
+        twin, result = loaded.replay(number)
+        assert (result, table(twin)) == played[number]
@@ -0,0 +1,48 @@
+from rng import NumpyRng, streams
+
+
+def draws(rng, count=50):
+    return [rng.randrange(0, 1000) for _ in range(count)]
+
+
+def test_spawned_streams_are_independent():
+    first, second = streams(3, 2, batch=8)
+    assert draws(first) != draws(second)
+    alone = streams(3, 2, batch=8)[1]
+    other, mixed = streams(3, 2, batch=8)
+    draws(other, 500)  # drawing from one stream leaves the others as they were
+    assert draws(mixed) == draws(alone)
+
+
+def test_same_seed_same_stream():
+    assert draws(NumpyRng(5)) == draws(NumpyRng(5))
+
+
+def test_shuffles_are_permutations_across_batches():
+    rng = NumpyRng(1, batch=4)
+    cards = bytearray(range(52))
+    orders = set()
+    for _ in range(10):  # more than two batches
+        rng.shuffle(cards)
+        assert sorted(cards) == list(range(52))
+        orders.add(bytes(cards))
+    assert len(orders) == 10
+
+
+def test_randrange_stays_in_range():
+    rng = NumpyRng(2, batch=2)
+    for start in range(0, 300):
+        assert start <= rng.randrange(start, 312) < 312
+
+
+def test_state_goes_on_the_same():
+    rng = NumpyRng(4, batch=4)
+    cards = bytearray(range(52))
+    for _ in range(6):
+        rng.shuffle(cards)
+    draws(rng, 300)
+    state, kept = rng.getstate(), bytes(cards)
+    expected = [(rng.shuffle(cards), bytes(cards), rng.randrange(0, 52))[1:] for _ in range(8)]
+    again, cards = NumpyRng(0), bytearray(kept)
+    again.setstate(state)
+    assert [(again.shuffle(cards), bytes(cards), again.randrange(0, 52))[1:] for _ in range(8)] == expected
@@ -0,0 +1,83 @@
+import asyncio
+
+from blackjackmodify import MIN_BET, Player
+from server import BACKLOG, Seat, TableServer
+
+
+class Transport:
+    def __init__(self, waiting=0):
+        self.waiting = waiting
+        self.aborted = False
+
+    def get_write_buffer_size(self):
+        return self.waiting
+
+    def abort(self):
+        self.aborted = True
+
+
+class Writer:
+    """a StreamWriter whose client never reads"""
+
+    def __init__(self, closing=False, waiting=0):
+        self.transport = Transport(waiting)
+        self.closing = closing
+        self.written = []
+
+    def is_closing(self):
+        return self.closing
+
+    def write(self, data):
+        self.written.append(data)
+
+    async def drain(self):
+        await asyncio.sleep(3600)
+
+
+def test_nothing_is_sent_to_a_closing_connection():
+    seat = Seat(Player("seat 1", MIN_BET), Writer(closing=True))
+    seat.send("show hello")
+    seat.send("show again")
+    assert seat.writer.written == []
+    assert not seat.connected
+
+
+def test_a_seat_with_too_much_waiting_is_dropped():
+    seat = Seat(Player("seat 1", MIN_BET), Writer(waiting=BACKLOG + 1))
+    seat.send("show hello")
+    assert seat.writer.written == [] and seat.writer.transport.aborted and not seat.connected
+
+
+def test_a_seat_that_does_not_read_is_dropped_after_the_timeout():
+    seat = Seat(Player("seat 1", MIN_BET), Writer())
+    asyncio.run(seat.drain(0.01))
+    assert seat.writer.transport.aborted and not seat.connected
+
+
+def test_a_round_is_played_over_tcp():
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"join 1\n")
+        seen = []
+        while not any(line.startswith("show calculating result") for line in seen):
+            line = (await reader.readline()).decode().strip()
+            seen.append(line)
+            if line.startswith("ask "):
+                _, number, kind = line.split(" ")[:3]
+                writer.write(f'{number} {"stand" if kind == "choose" else "no"}\n'.encode())
+        writer.close()
+        return seen
+
+    async def main():
+        tables = TableServer(tables=1, seats=2, timeout=2.0, pause=0.0, seed=1)
+        server = await asyncio.start_server(tables.handle, "127.0.0.1", 0)
+        runner = asyncio.create_task(tables.tables[0].run())
+        try:
+            return await asyncio.wait_for(client(server.sockets[0].getsockname()[1]), 10)
+        finally:
+            runner.cancel()
+            server.close()
+
+    seen = asyncio.run(main())
+    assert seen[0] == "seat 1 1"
+    assert not any(line.startswith("timeout") for line in seen)
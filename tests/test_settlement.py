@@ -0,0 +1,80 @@
+import pytest
+
+from blackjackmodify import MIN_BET, Player, Poker
+from settlement import Outcome, money, outcome_of, settle
+
+
+def empty_result():
+    return {"win_with_21": [], "bigger_than_host": [], "lost": [], "draw": []}
+
+
+def settled(outcomes, insured=False, surrendered=False, split=False, host_blackjack=False):
+    player = Player("player 1", MIN_BET)
+    if split:
+        deck = Poker()
+        player.get(deck[0])
+        player.get(deck[13])
+        player.split(deck)
+    if insured:
+        player.decide_insurance()
+    if surrendered:
+        player.surrender()
+    result = settle([player], [outcomes], empty_result(), host_blackjack)
+    return player, result
+
+
+@pytest.mark.parametrize("outcome, net, bucket", [
+    (Outcome.LOST, -MIN_BET, "lost"),
+    (Outcome.DRAW, 0, "draw"),
+    (Outcome.WIN, MIN_BET, "bigger_than_host"),
+    (Outcome.WIN_21, MIN_BET * 3 // 2, "win_with_21"),
+    (Outcome.HOST_BLACKJACK, -MIN_BET, "lost"),
+])
+def test_payout_of_one_hand(outcome, net, bucket):
+    player, result = settled((outcome,))
+    assert player.net == net
+    assert result[bucket] == ["player 1"]
+    assert player.hand.outcome == outcome
+
+
+def test_insurance_against_a_host_blackjack_breaks_even():
+    player, result = settled((Outcome.HOST_BLACKJACK,), insured=True, host_blackjack=True)
+    assert player.net == 0
+    assert result["draw"] == ["player 1"]
+
+
+def test_insured_natural_against_a_host_blackjack_is_paid_even_money():
+    player, result = settled((Outcome.DRAW,), insured=True, host_blackjack=True)
+    assert player.net == MIN_BET
+    assert result["draw"] == ["player 1"]
+
+
+def test_insurance_is_lost_when_the_host_has_no_blackjack():
+    player, result = settled((Outcome.WIN,), insured=True)
+    assert player.net == MIN_BET - MIN_BET // 2
+
+
+def test_surrender_loses_half_the_bet():
+    player, result = settled((Outcome.LOST,), surrendered=True)
+    assert player.net == -MIN_BET // 2
+    assert not any(result.values())
+
+
+def test_split_hands_are_settled_one_by_one():
+    player, result = settled((Outcome.WIN, Outcome.LOST), split=True)
+    assert player.net == 0
+    assert result["bigger_than_host"] == ["player 1's first hand"]
+    assert result["lost"] == ["player 1's second hand"]
+
+
+@pytest.mark.parametrize("total, host, outcome", [
+    (False, 20, Outcome.LOST), (False, False, Outcome.LOST), (20, False, Outcome.WIN),
+    (21, 20, Outcome.WIN_21), (18, 18, Outcome.DRAW), (17, 19, Outcome.LOST), (19, 17, Outcome.WIN),
+])
+def test_outcome_of(total, host, outcome):
+    assert outcome_of(total, host) == outcome
+
+
+def test_money():
+    assert money(MIN_BET) == "100"
+    assert money(MIN_BET * 3 // 2 + 5) == "150.05"
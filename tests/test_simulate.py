@@ -0,0 +1,65 @@
+import numpy as np
+
+from blackjackmodify import MIN_BET, Player, Poker
+from columns import load
+from policy import basic, compile_policy
+from simulate import Rules, play_chunk, simulate
+
+
+class Watched:
+    """the basic policy, checking the seat's stake at every first decision of a round"""
+
+    def __init__(self, bet):
+        self.policy = compile_policy(basic)
+        self.bet = bet
+        self.checked = 0
+
+    def watch(self, host):
+        self.policy.watch(host)
+
+    def choose(self, player, hand, options):
+        if len(player.hands) == 1 and len(hand) == 2:  # nothing doubled or split yet
+            assert hand.bet == self.bet
+            assert player.staked == self.bet + player.insurance
+            self.checked += 1
+        return self.policy.choose(player, hand, options)
+
+    def hit_again(self, player, hand):
+        return self.policy.hit_again(player, hand)
+
+    def insure(self, player):
+        return self.policy.insure(player)
+
+    def rebuy(self, player):
+        return self.policy.rebuy(player)
+
+
+def test_reset_drops_the_split_hands():
+    deck = Poker()
+    player = Player("player 1", MIN_BET)
+    player.get(deck[0])
+    player.get(deck[13])  # the other Ace
+    player.split(deck)
+    assert player.all_bets == 2 * MIN_BET
+    player.reset(MIN_BET)
+    assert len(player.hands) == 1 and player.bet == MIN_BET and len(player.hand) == 0
+
+
+def test_every_round_starts_from_the_rules_bet():
+    rules = Rules(decks=4, seats=2)
+    strategy = Watched(rules.bet)
+    stats = play_chunk((3000, strategy, rules, 0, 0, None, None, False, None, 0.0))
+    assert stats.hands > stats.returns.count * rules.seats  # there were splits
+    assert strategy.checked > 3000
+
+
+def test_net_stays_within_the_wagers(tmp_path):
+    # a seat loses at most its bet doubled on every hand and half a bet of insurance,
+    # and wins at most 3:2 on every doubled hand
+    simulate(3000, compile_policy(basic), Rules(decks=4, seats=2), columns=str(tmp_path))
+    columns = load(str(tmp_path))
+    outcomes, net = np.concatenate(columns["outcomes"]), np.concatenate(columns["net"])
+    hands = (outcomes >= 0).sum(axis=1)
+    assert (hands > 1).any()
+    assert (net >= -(2 * hands + 0.5) * MIN_BET).all()
+    assert (net <= 3 * hands * MIN_BET).all()
@@ -0,0 +1,35 @@
+import random
+import statistics
+
+import pytest
+
+from stats import Moments
+
+
+def moments_of(values):
+    moments = Moments()
+    for value in values:
+        moments.add(value)
+    return moments
+
+
+@pytest.mark.parametrize("cuts", [[0, 1000], [0, 1, 2, 1000], [0, 0, 400, 999, 1000], [0, 250, 500, 750, 1000]])
+def test_merged_parts_match_one_pass(cuts):
+    # returns of a round are a few whole bets around a small mean, with a far outlier
+    rng = random.Random(6)
+    values = [rng.choice((-2, -1, -1, 0, 1, 1, 1.5, 2)) + 1e6 * (index == 500) for index in range(1000)]
+    merged = Moments()
+    for start, stop in zip(cuts, cuts[1:]):
+        merged.merge(moments_of(values[start:stop]))
+    single = moments_of(values)
+    assert merged.count == single.count == len(values)
+    assert merged.mean == pytest.approx(single.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(single.variance, rel=1e-12)
+    assert merged.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+
+
+def test_empty_and_single_values():
+    assert Moments().merge(Moments()).count == 0
+    one = moments_of([3.0])
+    assert one.variance == 0.0 and one.half_width == float("inf")
+    assert Moments().merge(one).mean == 3.0